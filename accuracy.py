@@ -0,0 +1,311 @@
+import argparse
+import bisect
+import datetime
+import importlib
+import json
+import math
+import random
+import sys
+import time
+from logic.ephemeris import get_planetary_positions, PRECISION_FULL, PRECISION_FAST
+from logic.calculator import calculate_aspects, DEFAULT_ASPECT_RULES
+from logic.preview import preview_aspects, classification_edges
+from logic.timeline import search_intervals
+
+# Golden dataset written by `generate` and read by `compare`
+DEFAULT_GOLDEN_PATH = "golden_dataset.json"
+
+# Pairs whose reference separation is this close to an orb edge count as
+# boundary cases when an engine classifies them differently
+BOUNDARY_MARGIN_DEG = 0.25
+
+# Exact aspect hits are searched in this window after the first instants of the dataset
+HIT_WINDOW = datetime.timedelta(days=2)
+
+# An aspect interval counts as an exact hit when its pair gets this close to the rule angle
+HIT_ORB_DEG = 0.05
+
+# Hits this close to a window end are left out; another engine may clip them there
+HIT_EDGE_MARGIN = datetime.timedelta(hours=2)
+
+def _full_engine(dt, rules, orb):
+    positions = get_planetary_positions(dt)
+    return positions, calculate_aspects(positions, rules, orb)
+
+def _fast_engine(dt, rules, orb):
+    positions = get_planetary_positions(dt, precision=PRECISION_FAST)
+    return positions, calculate_aspects(positions, rules, orb)
+
+def _preview_engine(dt, rules, orb):
+    return preview_aspects(dt, rules, orb)
+
+# Engines that can be checked against the golden dataset.
+# Each takes (datetime, rules, orb) and returns (positions dict, aspects list).
+ENGINES = {
+    "full": _full_engine,
+    "fast": _fast_engine,
+    "preview": _preview_engine,
+}
+
+# Ephemeris precision each named engine uses when searching for exact hit times
+ENGINE_PRECISION = {
+    "full": PRECISION_FULL,
+    "fast": PRECISION_FAST,
+}
+
+def resolve_engine(name: str):
+    """An engine from ENGINES, or any "module:function" with the same signature."""
+    if name in ENGINES:
+        return ENGINES[name]
+    if ":" in name:
+        module_name, func_name = name.split(":", 1)
+        return getattr(importlib.import_module(module_name), func_name)
+    raise ValueError(f"Unknown engine: {name}")
+
+def _aspect_keys(aspects):
+    """{(planet1, planet2): (aspect_name, trend)} with a stable pair order."""
+    keys = {}
+    for a in aspects:
+        pair = tuple(sorted((a["planet1"], a["planet2"])))
+        keys[pair] = (a["aspect_name"], a["trend"])
+    return keys
+
+def _exact_hits(dt, rules, orb, precision):
+    """{(planet1, planet2, aspect_name): [exact datetime]} of the intervals in HIT_WINDOW after dt."""
+    hits = {}
+    for iv in search_intervals(dt, dt + HIT_WINDOW, rules, orb, precision=precision):
+        hits.setdefault((iv["planet1"], iv["planet2"], iv["aspect_name"]), []).append((iv["exact"], iv["min_orb"]))
+    return hits
+
+def generate_golden(path: str = DEFAULT_GOLDEN_PATH, count: int = 2000, seed: int = 1,
+                    start: datetime.datetime = datetime.datetime(1900, 1, 1),
+                    end: datetime.datetime = datetime.datetime(2100, 1, 1),
+                    rules: dict = None, orb: float = 3.0, hit_windows: int = 50):
+    """
+    Writes reference positions and aspects at `count` seeded random instants.
+
+    Aspects at single instants only check classification. The first
+    `hit_windows` instants also record the exact aspect hits in the
+    HIT_WINDOW after them, so engines can be checked on timing as well.
+
+    Returns:
+        dict: the dataset that was written
+    """
+    if rules is None:
+        rules = DEFAULT_ASPECT_RULES
+
+    rng = random.Random(seed)
+    span_minutes = int((end - start).total_seconds() // 60)
+    instants = sorted(start + datetime.timedelta(minutes=rng.randrange(span_minutes)) for _ in range(count))
+
+    samples = []
+    t0 = time.perf_counter()
+    for dt in instants:
+        positions, aspects = _full_engine(dt, rules, orb)
+        samples.append({
+            "time": dt.isoformat(),
+            "positions": positions,
+            "aspects": [[a["planet1"], a["planet2"], a["aspect_name"], a["trend"], a["orb_diff"]] for a in aspects],
+        })
+    elapsed = time.perf_counter() - t0
+
+    for sample, dt in zip(samples[:hit_windows], instants):
+        lo, hi = dt + HIT_EDGE_MARGIN, dt + HIT_WINDOW - HIT_EDGE_MARGIN
+        sample["hits"] = [
+            [p1, p2, name, exact.isoformat()]
+            for (p1, p2, name), found in _exact_hits(dt, rules, orb, PRECISION_FULL).items()
+            for exact, min_orb in found
+            if min_orb <= HIT_ORB_DEG and lo <= exact <= hi
+        ]
+
+    dataset = {
+        "meta": {
+            "seed": seed,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "count": count,
+            "orb": orb,
+            "rules": [[float(angle), info] for angle, info in rules.items()],
+            "seconds_per_instant": elapsed / max(count, 1),
+            "hit_window_hours": HIT_WINDOW.total_seconds() / 3600.0,
+        },
+        "samples": samples,
+    }
+    with open(path, "w") as f:
+        json.dump(dataset, f)
+    return dataset
+
+def load_golden(path: str = DEFAULT_GOLDEN_PATH):
+    """Reads a golden dataset, restoring the float-keyed rules."""
+    with open(path) as f:
+        dataset = json.load(f)
+    dataset["meta"]["rules"] = {angle: info for angle, info in dataset["meta"]["rules"]}
+    return dataset
+
+def compare_engine(dataset: dict, engine, hit_precision: str = None):
+    """
+    Runs one engine over every golden instant and measures its error.
+
+    Args:
+        dataset: from load_golden or generate_golden
+        engine: callable (datetime, rules, orb) -> (positions, aspects)
+        hit_precision: ephemeris precision to search exact hits with, as in
+                       ENGINE_PRECISION; None skips the hit check
+
+    Returns:
+        dict: {bodies: {planet: {max, rms}}, mismatches, boundary_mismatches,
+               seconds_per_instant, hits, missed_hits, hit_max_minutes}
+    """
+    meta = dataset["meta"]
+    rules = meta["rules"]
+    orb = meta["orb"]
+    edges = classification_edges(rules, orb, [])
+
+    squares = {}
+    maxima = {}
+    mismatches = 0
+    boundary_mismatches = 0
+    elapsed = 0.0
+    hits = 0
+    missed_hits = 0
+    hit_max_minutes = 0.0
+
+    for sample in dataset["samples"]:
+        dt = datetime.datetime.fromisoformat(sample["time"])
+        t0 = time.perf_counter()
+        positions, aspects = engine(dt, rules, orb)
+        elapsed += time.perf_counter() - t0
+
+        golden = sample["positions"]
+        for planet, deg in golden.items():
+            error = abs((positions[planet] - deg + 180.0) % 360.0 - 180.0)
+            squares[planet] = squares.get(planet, 0.0) + error * error
+            maxima[planet] = max(maxima.get(planet, 0.0), error)
+
+        expected = _aspect_keys({"planet1": a[0], "planet2": a[1], "aspect_name": a[2], "trend": a[3]}
+                                for a in sample["aspects"])
+        found = _aspect_keys(aspects)
+        for pair in set(expected) | set(found):
+            if expected.get(pair) == found.get(pair):
+                continue
+            mismatches += 1
+            diff = abs(golden[pair[0]] - golden[pair[1]])
+            if diff > 180:
+                diff = 360 - diff
+            k = bisect.bisect_left(edges, diff)
+            near = [edges[n] for n in (k - 1, k) if 0 <= n < len(edges)]
+            if any(abs(diff - edge) <= BOUNDARY_MARGIN_DEG for edge in near):
+                boundary_mismatches += 1
+
+        if hit_precision is None or not sample.get("hits"):
+            continue
+        found = _exact_hits(dt, rules, orb, hit_precision)
+        for p1, p2, name, exact in sample["hits"]:
+            hits += 1
+            exact = datetime.datetime.fromisoformat(exact)
+            candidates = found.get((p1, p2, name))
+            if not candidates:
+                missed_hits += 1
+                continue
+            error = min(abs((t - exact).total_seconds()) for t, _ in candidates) / 60.0
+            hit_max_minutes = max(hit_max_minutes, error)
+
+    count = max(len(dataset["samples"]), 1)
+    return {
+        "bodies": {
+            planet: {"max": maxima[planet], "rms": math.sqrt(squares[planet] / count)}
+            for planet in maxima
+        },
+        "mismatches": mismatches,
+        "boundary_mismatches": boundary_mismatches,
+        "seconds_per_instant": elapsed / count,
+        "hits": hits,
+        "missed_hits": missed_hits,
+        "hit_max_minutes": hit_max_minutes,
+    }
+
+def format_report(dataset: dict, reports: dict):
+    """Side-by-side text table of compare_engine results per engine."""
+    names = list(reports.keys())
+    lines = []
+    header = f"{'':<22}" + "".join(f"{name:>22}" for name in names)
+    lines.append(header)
+    lines.append("-" * len(header))
+
+    planets = list(dataset["samples"][0]["positions"].keys()) if dataset["samples"] else []
+    for planet in planets:
+        cells = [f"{reports[n]['bodies'][planet]['max']:.5f} / {reports[n]['bodies'][planet]['rms']:.5f}" for n in names]
+        lines.append(f"{planet + ' max/rms (deg)':<22}" + "".join(f"{c:>22}" for c in cells))
+
+    lines.append(f"{'aspect mismatches':<22}" + "".join(f"{reports[n]['mismatches']:>22}" for n in names))
+    lines.append(f"{'  at orb boundary':<22}" + "".join(f"{reports[n]['boundary_mismatches']:>22}" for n in names))
+    cells = [f"{reports[n]['hit_max_minutes']:.1f} ({reports[n]['missed_hits']}/{reports[n]['hits']} missed)"
+             if reports[n]["hits"] else "-" for n in names]
+    lines.append(f"{'exact hit error (min)':<22}" + "".join(f"{c:>22}" for c in cells))
+
+    reference_ms = dataset["meta"]["seconds_per_instant"] * 1000
+    cells = [f"{reports[n]['seconds_per_instant'] * 1000:.3f} ({reference_ms / max(reports[n]['seconds_per_instant'] * 1000, 1e-9):.1f}x)"
+             for n in names]
+    lines.append(f"{'ms per instant':<22}" + "".join(f"{c:>22}" for c in cells))
+    lines.append(f"Reference: {dataset['meta']['count']} instants, {reference_ms:.3f} ms per instant")
+    return "\n".join(lines)
+
+def check_report(report: dict, max_error: float, max_mismatches: int, max_hit_minutes: float = None):
+    """True when an engine stays within the pass/fail thresholds."""
+    worst = max((b["max"] for b in report["bodies"].values()), default=0.0)
+    if max_hit_minutes is not None and (report["missed_hits"] or report["hit_max_minutes"] > max_hit_minutes):
+        return False
+    return worst <= max_error and report["mismatches"] <= max_mismatches
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Golden-dataset accuracy harness")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="write the reference dataset")
+    gen.add_argument("--path", default=DEFAULT_GOLDEN_PATH)
+    gen.add_argument("--count", type=int, default=2000)
+    gen.add_argument("--seed", type=int, default=1)
+    gen.add_argument("--start", default="1900-01-01")
+    gen.add_argument("--end", default="2100-01-01")
+    gen.add_argument("--orb", type=float, default=3.0)
+    gen.add_argument("--hit-windows", type=int, default=50, help="instants that also record exact hits")
+
+    cmp_parser = sub.add_parser("compare", help="check engines against the dataset")
+    cmp_parser.add_argument("--path", default=DEFAULT_GOLDEN_PATH)
+    cmp_parser.add_argument("--engines", nargs="+", default=["fast", "preview"],
+                            help=f"any of {', '.join(ENGINES)} or module:function")
+    cmp_parser.add_argument("--max-error", type=float, default=None, help="fail above this error (deg)")
+    cmp_parser.add_argument("--max-mismatches", type=int, default=None, help="fail above this many mismatches")
+    cmp_parser.add_argument("--max-hit-minutes", type=float, default=None,
+                            help="fail on a missed exact hit or one off by more than this")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        dataset = generate_golden(
+            args.path, args.count, args.seed,
+            datetime.datetime.fromisoformat(args.start), datetime.datetime.fromisoformat(args.end),
+            orb=args.orb, hit_windows=args.hit_windows
+        )
+        print(f"Wrote {dataset['meta']['count']} instants to {args.path}")
+        return 0
+
+    dataset = load_golden(args.path)
+    reports = {name: compare_engine(dataset, resolve_engine(name), ENGINE_PRECISION.get(name))
+               for name in args.engines}
+    print(format_report(dataset, reports))
+
+    if args.max_error is None and args.max_mismatches is None and args.max_hit_minutes is None:
+        return 0
+    max_error = args.max_error if args.max_error is not None else float("inf")
+    max_mismatches = args.max_mismatches if args.max_mismatches is not None else sys.maxsize
+    failed = [name for name, report in reports.items()
+              if not check_report(report, max_error, max_mismatches, args.max_hit_minutes)]
+    if failed:
+        print(f"FAIL: {', '.join(failed)}")
+        return 1
+    print("PASS")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
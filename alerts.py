@@ -0,0 +1,320 @@
+import bisect
+import copy
+import datetime
+import heapq
+import itertools
+import threading
+from logic.calculator import calculate_aspects, DEFAULT_ASPECT_RULES
+from logic.cache import rules_fingerprint
+from logic.separation import separation
+from logic.sampling import SampledTracks, floor_time, ceil_time
+
+# The horizon is extended a day at a time as the clock moves on
+EXTEND_STEP = datetime.timedelta(days=1)
+
+def _runs(gaps):
+    """(first, last) sample indices of each run of negative gaps."""
+    runs = []
+    first = None
+    for k, g in enumerate(gaps):
+        if g < 0.0 and first is None:
+            first = k
+        elif g >= 0.0 and first is not None:
+            runs.append((first, k - 1))
+            first = None
+    if first is not None:
+        runs.append((first, len(gaps) - 1))
+    return runs
+
+def find_alert_windows(start: datetime.datetime, end: datetime.datetime, rules: dict = None, orb: float = 3.0,
+                       specific_rules: list = None, range_rules: list = None, threshold: float = 1.0):
+    """
+    Finds every interval in [start, end] where a pair is within `threshold`
+    degrees of one of the rule angles (never wider than the orb itself).
+
+    Positions are computed once per sampling.SAMPLE_STEP; edges and the exact time are
+    refined on the linearly interpolated longitudes.
+
+    Returns:
+        list of dicts: [{planet1, planet2, angle, aspect_name, trend, start, end,
+                         exact, min_orb, open_start, open_end}] sorted by start.
+        open_start/open_end mark windows already active at `start` or still
+        active at `end`.
+    """
+    if rules is None:
+        rules = DEFAULT_ASPECT_RULES
+    threshold = min(threshold, orb)
+
+    sampled = SampledTracks(start, end)
+    names = sampled.names
+    tracks = sampled.tracks
+    times = sampled.times
+    last = sampled.last
+    lon_at = sampled.lon_at
+    time_at = sampled.time_at
+
+    windows = []
+    for i in range(len(names)):
+        for j in range(i + 1, len(names)):
+            p1 = names[i]
+            p2 = names[j]
+            seps = [separation(a, b) for a, b in zip(tracks[p1], tracks[p2])]
+
+            for angle in rules.keys():
+                target = float(angle)
+                gaps = [abs(s - target) - threshold for s in seps]
+                if min(gaps) >= 0.0:
+                    continue
+
+                def gap(x):
+                    return abs(separation(lon_at(p1, x), lon_at(p2, x)) - target) - threshold
+
+                def inside(x):
+                    return gap(x) < 0.0
+
+                for first, last_inside in _runs(gaps):
+                    window = {
+                        "start": times[0] if first == 0 else time_at(sampled.edge(inside, first - 1, first)),
+                        "end": times[-1] if last_inside == last else time_at(sampled.edge(inside, last_inside + 1, last_inside)),
+                        "open_start": first == 0,
+                        "open_end": last_inside == last,
+                    }
+
+                    # Exact time: ternary search around the closest sample
+                    k_best = min(range(first, last_inside + 1), key=lambda k: gaps[k])
+                    x = sampled.closest(gap, float(max(k_best - 1, 0)), float(min(k_best + 1, last)))
+                    lon1 = lon_at(p1, x) % 360.0
+                    lon2 = lon_at(p2, x) % 360.0
+
+                    # Trend and name exactly as calculate_aspects would report them
+                    match = calculate_aspects({p1: lon1, p2: lon2}, {angle: rules[angle]}, threshold,
+                                              specific_rules, range_rules)
+                    info = match[0] if match else {"aspect_name": rules[angle]["name"], "trend": rules[angle]["trend"]}
+                    window.update({
+                        "planet1": p1,
+                        "planet2": p2,
+                        "angle": target,
+                        "aspect_name": info["aspect_name"],
+                        "trend": info["trend"],
+                        "exact": time_at(x),
+                        "min_orb": abs(separation(lon1, lon2) - target),
+                    })
+                    windows.append(window)
+
+    windows.sort(key=lambda w: w["start"])
+    return windows
+
+class AlertFeed:
+    """
+    Close-aspect windows for one rule set and threshold, shared by every
+    session using those rules.
+
+    Windows are computed once, from whole-hour sample instants, and extended
+    a day at a time as subscribers ask for a longer horizon. Sessions asking
+    at the same time wait for one computation instead of repeating it.
+    """
+    def __init__(self, rule_args: tuple, threshold: float):
+        # Copied so later edits by a session cannot change the feed
+        self.rule_args = copy.deepcopy(rule_args)
+        self.threshold = threshold
+        self.subscribers = 0
+        self.computed = 0
+
+        self._lock = threading.Lock()
+        self._windows = []
+        self._starts = []
+        self._open = {}
+        self._covered_from = None
+        self._covered_until = None
+
+    def extend_to(self, now: datetime.datetime, target: datetime.datetime):
+        """
+        Makes sure windows are known from now up to target.
+
+        Returns:
+            datetime: the end of the covered range
+        """
+        with self._lock:
+            covered = self._covered_until
+            if covered is None or not self._covered_from <= now <= covered:
+                # First use, or a clock outside the known range: start over
+                chunk_start, chunk_end = floor_time(now), ceil_time(target)
+                self._windows, self._open = [], {}
+                self._covered_from = chunk_start
+            elif covered < target:
+                chunk_start, chunk_end = covered, ceil_time(max(target, covered + EXTEND_STEP))
+            else:
+                return covered
+
+            windows = find_alert_windows(chunk_start, chunk_end, *self.rule_args, threshold=self.threshold)
+            self.computed += 1
+            for w in windows:
+                key = (w["planet1"], w["planet2"], w["angle"])
+                previous = self._open.pop(key, None)
+                if w["open_start"] and previous is not None:
+                    # Continuation of a window left open by the previous chunk
+                    previous["end"] = w["end"]
+                    previous["open_end"] = w["open_end"]
+                    if w["min_orb"] < previous["min_orb"]:
+                        previous.update({"exact": w["exact"], "min_orb": w["min_orb"]})
+                    w = previous
+                else:
+                    self._windows.append(w)
+                if w["open_end"]:
+                    self._open[key] = w
+
+            # Windows over before now are of no use to any subscriber
+            self._windows = sorted((w for w in self._windows if w["end"] > now), key=lambda w: w["start"])
+            self._starts = [w["start"] for w in self._windows]
+            self._covered_until = chunk_end
+            return chunk_end
+
+    def windows_after(self, t: datetime.datetime):
+        """Known windows starting strictly after t, by start."""
+        with self._lock:
+            return self._windows[bisect.bisect_right(self._starts, t):]
+
+class AlertService:
+    """
+    Process-wide registry of AlertFeeds, one per rule set and threshold, so
+    alert windows are computed once per distinct rule set rather than once
+    per connected session.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._feeds = {}
+
+    def subscribe(self, rules: dict = None, orb: float = 3.0, specific_rules: list = None,
+                  range_rules: list = None, threshold: float = 1.0):
+        """The shared feed for these rules; unsubscribe it when done."""
+        key = (rules_fingerprint(rules, orb, specific_rules, range_rules), threshold)
+        with self._lock:
+            feed = self._feeds.get(key)
+            if feed is None:
+                feed = self._feeds[key] = AlertFeed((rules, orb, specific_rules, range_rules), threshold)
+            feed.subscribers += 1
+            return feed
+
+    def unsubscribe(self, feed: AlertFeed):
+        """Drops the feed once its last subscriber is gone."""
+        with self._lock:
+            feed.subscribers -= 1
+            if feed.subscribers <= 0:
+                self._feeds = {k: f for k, f in self._feeds.items() if f is not feed}
+
+    def stats(self):
+        """
+        Returns:
+            dict: {feeds, subscribers, computed}
+        """
+        with self._lock:
+            feeds = list(self._feeds.values())
+        return {
+            "feeds": len(feeds),
+            "subscribers": sum(f.subscribers for f in feeds),
+            "computed": sum(f.computed for f in feeds),
+        }
+
+_alert_service = None
+_alert_service_lock = threading.Lock()
+
+def get_alert_service():
+    """Returns the process-wide AlertService, creating it on first use."""
+    global _alert_service
+    with _alert_service_lock:
+        if _alert_service is None:
+            _alert_service = AlertService()
+        return _alert_service
+
+class AlertScheduler:
+    """
+    One session's upcoming close-aspect windows, in a priority queue ordered
+    by when they should be announced (start minus `lead`).
+
+    The windows themselves come from the shared AlertFeed for the session's
+    rules; the scheduler only keeps which of them this session still has to
+    announce. Checking for due alerts is a heap peek.
+    """
+    def __init__(self, threshold: float = 1.0, horizon: datetime.timedelta = datetime.timedelta(days=7),
+                 lead: datetime.timedelta = datetime.timedelta(minutes=30), service: AlertService = None):
+        self.threshold = threshold
+        self.horizon = horizon
+        self.lead = lead
+        self.service = service if service is not None else get_alert_service()
+
+        self._lock = threading.Lock()
+        self._fingerprint = None
+        self._feed = None
+        self._pulled_until = None
+        self._queue = []
+        self._seq = itertools.count()
+
+    def set_rules(self, rules: dict = None, orb: float = 3.0, specific_rules: list = None, range_rules: list = None):
+        """
+        Records the active rule set. The queue is dropped only if the rules
+        actually changed; it is refilled on the next call to schedule().
+
+        Returns:
+            bool: True if the rules changed
+        """
+        fingerprint = rules_fingerprint(rules, orb, specific_rules, range_rules)
+        with self._lock:
+            if fingerprint == self._fingerprint:
+                return False
+            previous = self._feed
+            self._fingerprint = fingerprint
+            self._feed = self.service.subscribe(rules, orb, specific_rules, range_rules, self.threshold)
+            self._pulled_until = None
+            self._queue = []
+        if previous is not None:
+            self.service.unsubscribe(previous)
+        return True
+
+    def schedule(self, now: datetime.datetime):
+        """Makes sure windows are known up to now + horizon."""
+        if self._feed is None:
+            self.set_rules(DEFAULT_ASPECT_RULES, 3.0, [], [])
+        with self._lock:
+            feed = self._feed
+            since = self._pulled_until
+        covered = feed.extend_to(now, now + self.horizon)
+
+        with self._lock:
+            if feed is not self._feed:
+                # Rules changed meanwhile; the next call starts over
+                return
+            # Windows already running when the queue is built are not upcoming
+            for w in feed.windows_after(now if since is None else since):
+                heapq.heappush(self._queue, (w["start"] - self.lead, next(self._seq), w))
+            self._pulled_until = covered
+
+    def next_fire_time(self):
+        """When the next alert is due, or None if the queue is empty."""
+        with self._lock:
+            return self._queue[0][0] if self._queue else None
+
+    def pop_due(self, now: datetime.datetime):
+        """
+        Removes and returns the windows whose announcement time has come.
+        Windows that already ended are dropped silently.
+        """
+        due = []
+        with self._lock:
+            while self._queue and self._queue[0][0] <= now:
+                _, _, window = heapq.heappop(self._queue)
+                if window["end"] > now:
+                    due.append(window)
+        return due
+
+    def upcoming(self):
+        """All queued windows in announcement order."""
+        with self._lock:
+            return [w for _, _, w in sorted(self._queue)]
+
+    def close(self):
+        """Leaves the shared feed; call when the session ends."""
+        with self._lock:
+            feed, self._feed, self._fingerprint = self._feed, None, None
+            self._queue = []
+        if feed is not None:
+            self.service.unsubscribe(feed)
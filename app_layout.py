@@ -1,15 +1,18 @@
 import flet as ft
 from ui.tables import PlanetaryPositionsTable, AspectsTable, PlanetSummaryTable
-from ui.settings import SettingsSidebar
+from ui.settings import SettingsSidebar, DEFAULT_BODIES
+from ui.chart import SeparationChart
 
 class AppLayout(ft.Column):
-    def __init__(self, on_settings_change, default_orb, default_rules, default_specific_rules, default_range_rules):
+    def __init__(self, on_settings_change, default_orb, default_rules, default_specific_rules, default_range_rules, bodies=None,
+                 on_chart_view_change=None):
         super().__init__(expand=True)
         
         self.positions_table = PlanetaryPositionsTable()
         self.summary_table = PlanetSummaryTable()
         self.aspects_table = AspectsTable()
-        self.settings_sidebar = SettingsSidebar(on_settings_change, default_orb, default_rules, default_specific_rules, default_range_rules)
+        self.settings_sidebar = SettingsSidebar(on_settings_change, default_orb, default_rules, default_specific_rules, default_range_rules, bodies)
+        self.separation_chart = SeparationChart(on_chart_view_change, bodies or DEFAULT_BODIES)
         
         # Header
         self.header = ft.Container(
@@ -84,9 +87,18 @@ class AppLayout(ft.Column):
         # Store reference to aspects container for resizing
         self.aspects_container = self.content_row.controls[2] 
         
+        # Bottom Panel: Separation over time
+        self.chart_container = ft.Container(
+            content=self.separation_chart,
+            padding=5,
+            border=ft.border.all(1, "grey300"),
+            border_radius=5
+        )
+        
         self.controls = [
             self.header,
-            self.content_row
+            self.content_row,
+            self.chart_container
         ]
 
     def resize(self, page_width):
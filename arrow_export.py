@@ -0,0 +1,200 @@
+import datetime
+from multiprocessing import shared_memory
+from logic.ephemeris import get_position_series, PRECISION_FULL, DEFAULT_AYANAMSA
+from logic.calculator import calculate_aspects, DEFAULT_ASPECT_RULES
+
+# pyarrow is optional: only this export layer needs it
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:
+    pa = None
+
+# Instants per record batch
+BATCH_SIZE = 4096
+
+# Trend values always present in the trend dictionary, so batches share one
+TRENDS = ["Positive", "Negative", "Neutral"]
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("Arrow export needs pyarrow (pip install pyarrow)")
+
+def _dictionary_column(values, dictionary, index):
+    """Dictionary-encoded string column; index maps value -> code and grows as needed."""
+    codes = []
+    for value in values:
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(dictionary)
+            dictionary.append(value)
+        codes.append(code)
+    return pa.DictionaryArray.from_arrays(pa.array(codes, pa.int32()), pa.array(dictionary, pa.string()))
+
+def positions_schema(bodies: list):
+    """Schema of position batches: time plus one float64 column per body."""
+    _require_pyarrow()
+    return pa.schema([("time", pa.timestamp("us"))] + [(body, pa.float64()) for body in bodies])
+
+def aspects_schema():
+    """Schema of aspect batches: one row per aspect found at an instant."""
+    _require_pyarrow()
+    label = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("time", pa.timestamp("us")),
+        ("planet1", label),
+        ("planet2", label),
+        ("aspect_name", label),
+        ("trend", label),
+        ("angle_deg", pa.float64()),
+        ("orb_diff", pa.float64()),
+    ])
+
+def positions_batch(times: list, columns: dict):
+    """
+    Args:
+        times: datetimes
+        columns: {PlanetName: [Degree per time]}, as from get_position_series
+
+    Returns:
+        pyarrow.RecordBatch
+    """
+    _require_pyarrow()
+    arrays = [pa.array(times, pa.timestamp("us"))] + [pa.array(columns[b], pa.float64()) for b in columns]
+    return pa.RecordBatch.from_arrays(arrays, schema=positions_schema(list(columns)))
+
+def aspects_batch(times: list, aspects_per_time: list, bodies: list, rules: dict = None):
+    """
+    Args:
+        times: datetimes
+        aspects_per_time: one calculate_aspects result per time
+        bodies: planet names, fixing the planet dictionaries
+        rules: rule set, fixing the aspect name dictionary
+
+    Returns:
+        pyarrow.RecordBatch
+    """
+    _require_pyarrow()
+    if rules is None:
+        rules = DEFAULT_ASPECT_RULES
+
+    row_times, p1, p2, names, trends, angles, orbs = [], [], [], [], [], [], []
+    for dt, aspects in zip(times, aspects_per_time):
+        for a in aspects:
+            row_times.append(dt)
+            p1.append(a["planet1"])
+            p2.append(a["planet2"])
+            names.append(a["aspect_name"])
+            trends.append(a["trend"])
+            angles.append(a["angle_deg"])
+            orbs.append(a["orb_diff"])
+
+    # Dictionaries seeded from the rules so every batch of a stream uses the same codes
+    planets = list(bodies)
+    planet_index = {b: k for k, b in enumerate(planets)}
+    aspect_names = list(dict.fromkeys(info["name"] for info in rules.values()))
+    trend_names = list(TRENDS)
+    arrays = [
+        pa.array(row_times, pa.timestamp("us")),
+        _dictionary_column(p1, planets, planet_index),
+        _dictionary_column(p2, planets, planet_index),
+        _dictionary_column(names, aspect_names, {n: k for k, n in enumerate(aspect_names)}),
+        _dictionary_column(trends, trend_names, {t: k for k, t in enumerate(trend_names)}),
+        pa.array(angles, pa.float64()),
+        pa.array(orbs, pa.float64()),
+    ]
+    return pa.RecordBatch.from_arrays(arrays, schema=aspects_schema())
+
+def iter_batches(start: datetime.datetime, end: datetime.datetime, step: datetime.timedelta,
+                 rules: dict = None, orb: float = 3.0, specific_rules: list = None, range_rules: list = None,
+                 precision: str = PRECISION_FULL, ayanamsa: str = DEFAULT_AYANAMSA, bodies: list = None,
+                 batch_size: int = BATCH_SIZE):
+    """
+    Yields (positions batch, aspects batch) for instants start, start + step, ... before end.
+
+    Positions come column-wise from get_position_series, so they go into
+    Arrow arrays without building a dict per instant.
+    """
+    _require_pyarrow()
+    t = start
+    while t < end:
+        times = []
+        while t < end and len(times) < batch_size:
+            times.append(t)
+            t += step
+
+        columns = get_position_series(times, precision=precision, ayanamsa=ayanamsa, bodies=bodies)
+        names = list(columns)
+        aspects = [
+            calculate_aspects({name: columns[name][k] for name in names}, rules, orb, specific_rules, range_rules)
+            for k in range(len(times))
+        ]
+        yield positions_batch(times, columns), aspects_batch(times, aspects, names, rules)
+
+def write_ipc_stream(batches, sink):
+    """
+    Writes record batches as one Arrow IPC stream.
+
+    Args:
+        batches: iterable of RecordBatch sharing one schema
+        sink: file path, or any pyarrow writable (NativeFile, buffer writer)
+
+    Returns:
+        int: number of batches written
+    """
+    _require_pyarrow()
+    batches = iter(batches)
+    first = next(batches, None)
+    if first is None:
+        return 0
+
+    opened = isinstance(sink, str)
+    if opened:
+        sink = pa.OSFile(sink, "wb")
+    try:
+        with pa.ipc.new_stream(sink, first.schema) as writer:
+            writer.write_batch(first)
+            count = 1
+            for batch in batches:
+                writer.write_batch(batch)
+                count += 1
+    finally:
+        if opened:
+            sink.close()
+    return count
+
+def read_ipc_file(path: str):
+    """Memory-maps an IPC stream file; the returned table's buffers point into the map."""
+    _require_pyarrow()
+    return pa.ipc.open_stream(pa.memory_map(path, "r")).read_all()
+
+def write_shared_memory(batches: list, name: str = None):
+    """
+    Writes record batches as an IPC stream straight into a new shared memory block.
+
+    The stream is sized first with a mock writer, so it is serialized once,
+    directly into the block.
+
+    Returns:
+        SharedMemory: the block; the caller unlinks it when consumers are done
+    """
+    _require_pyarrow()
+    batches = list(batches)
+    mock = pa.MockOutputStream()
+    write_ipc_stream(batches, mock)
+
+    block = shared_memory.SharedMemory(name=name, create=True, size=max(mock.size(), 1))
+    write_ipc_stream(batches, pa.FixedSizeBufferWriter(pa.py_buffer(block.buf)))
+    return block
+
+def read_shared_memory(name: str):
+    """
+    Opens a stream written by write_shared_memory without copying it.
+
+    Returns:
+        tuple: (pyarrow.Table, SharedMemory); keep the block open while the table is used
+    """
+    _require_pyarrow()
+    block = shared_memory.SharedMemory(name=name)
+    table = pa.ipc.open_stream(pa.py_buffer(block.buf)).read_all()
+    return table, block
@@ -0,0 +1,337 @@
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from logic.ephemeris import get_planetary_positions
+from logic.calculator import calculate_aspects, DEFAULT_ASPECT_RULES
+
+# Cache file location, overridable for shared or per-project caches
+DEFAULT_CACHE_PATH = os.environ.get(
+    "PLANETARY_CACHE_PATH",
+    os.path.join(os.path.expanduser("~"), ".planetary_aspects_cache.sqlite3")
+)
+
+# Default size budget of the cache file
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Pending inserts are written in one transaction once this many accumulate
+DEFAULT_BATCH_SIZE = 500
+
+# Version of the cached results, kept in the file's user_version. Bump it
+# whenever a change alters computed positions or aspects: files written with
+# another version are emptied on open rather than served.
+# 1: mean node treated as tropical
+CACHE_VERSION = 1
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS positions (
+    t INTEGER PRIMARY KEY,
+    data TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS aspects (
+    t INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (t, fingerprint)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS positions_created ON positions (created);
+CREATE INDEX IF NOT EXISTS aspects_created ON aspects (created);
+"""
+
+def time_key(dt: datetime.datetime, quantum_seconds: int = 1):
+    """Quantized UTC seconds since 1970 for a datetime (naive means UTC)."""
+    if dt.tzinfo:
+        dt = dt.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    seconds = int((dt - _EPOCH) // datetime.timedelta(seconds=1))
+    return seconds - seconds % quantum_seconds
+
+def key_to_datetime(key: int):
+    """Naive UTC datetime a time key stands for."""
+    return _EPOCH + datetime.timedelta(seconds=key)
+
+def rules_fingerprint(rules: dict = None, orb: float = 3.0, specific_rules: list = None, range_rules: list = None):
+    """
+    Stable hash of everything calculate_aspects depends on besides positions.
+
+    Rule order is kept, because calculate_aspects stops at the first matching
+    angle, specific rule or range rule.
+
+    Returns:
+        str: hex digest
+    """
+    if rules is None:
+        rules = DEFAULT_ASPECT_RULES
+    payload = {
+        "rules": [[float(angle), info] for angle, info in rules.items()],
+        "orb": float(orb),
+        "specific_rules": specific_rules or [],
+        "range_rules": range_rules or [],
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+class ResultCache:
+    """
+    On-disk cache of planetary positions and aspects, shareable between processes.
+
+    Positions are keyed by UTC time quantized to `quantum_seconds`; aspects by
+    that time plus the rule-set fingerprint. The database runs in WAL mode so
+    several processes can read while one writes. A file written by code with
+    a different CACHE_VERSION is emptied when opened.
+
+    The file uses incremental auto-vacuum, so pages freed by eviction are
+    handed back and the file shrinks to the size budget.
+    """
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES,
+                 quantum_seconds: int = 1, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.quantum_seconds = quantum_seconds
+        self.batch_size = batch_size
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        # Inserts waiting for the next batch, by key
+        self._pending_positions = {}
+        self._pending_aspects = {}
+
+        self._conn = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+        # Takes effect on a new file; an existing one is converted below
+        self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != CACHE_VERSION:
+            # Results from other code may differ from what this code computes
+            with self._conn:
+                self._conn.execute("DELETE FROM positions")
+                self._conn.execute("DELETE FROM aspects")
+                self._conn.execute(f"PRAGMA user_version = {CACHE_VERSION}")
+
+        if self._conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            # Written before auto-vacuum was used: one full VACUUM switches it on
+            try:
+                self._conn.execute("VACUUM")
+            except sqlite3.OperationalError:
+                # Another process is using the file; try again next time
+                pass
+
+    def time_key(self, dt: datetime.datetime):
+        """Quantized UTC seconds since 1970 for a datetime (naive means UTC)."""
+        return time_key(dt, self.quantum_seconds)
+
+    def key_to_datetime(self, key: int):
+        """Naive UTC datetime a time key stands for."""
+        return key_to_datetime(key)
+
+    def _lookup_positions(self, key):
+        # Returns (positions, hit); caller must not hold the lock
+        with self._lock:
+            pending = self._pending_positions.get(key)
+            if pending is not None:
+                return json.loads(pending[1]), True
+            row = self._conn.execute("SELECT data FROM positions WHERE t = ?", (key,)).fetchone()
+            if row is not None:
+                return json.loads(row[0]), True
+
+        positions = get_planetary_positions(self.key_to_datetime(key))
+        with self._lock:
+            self._pending_positions[key] = (key, json.dumps(positions), time.time())
+            self._maybe_flush()
+        return positions, False
+
+    def get_planetary_positions(self, dt: datetime.datetime):
+        """
+        Cached get_planetary_positions.
+
+        Positions are computed at the quantized time, so every process gets the
+        same answer for the same key.
+
+        Returns:
+            dict: {PlanetName: Degree (0-360)}
+        """
+        positions, hit = self._lookup_positions(self.time_key(dt))
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return positions
+
+    def calculate_aspects(self, dt: datetime.datetime, rules: dict = None, orb: float = 3.0,
+                          specific_rules: list = None, range_rules: list = None):
+        """
+        Cached calculate_aspects for the positions at `dt`.
+
+        Returns:
+            tuple: (positions dict, aspects list)
+        """
+        key = self.time_key(dt)
+        fingerprint = rules_fingerprint(rules, orb, specific_rules, range_rules)
+        with self._lock:
+            pending = self._pending_aspects.get((key, fingerprint))
+            if pending is not None:
+                data = pending[2]
+            else:
+                row = self._conn.execute(
+                    "SELECT data FROM aspects WHERE t = ? AND fingerprint = ?", (key, fingerprint)
+                ).fetchone()
+                data = row[0] if row is not None else None
+            if data is not None:
+                self.hits += 1
+                positions, aspects = json.loads(data)
+                return positions, aspects
+            self.misses += 1
+
+        positions, _ = self._lookup_positions(key)
+        aspects = calculate_aspects(positions, rules, orb, specific_rules, range_rules)
+        with self._lock:
+            # Positions are stored alongside so a repeat query is a single lookup
+            data = json.dumps([positions, aspects])
+            self._pending_aspects[(key, fingerprint)] = (key, fingerprint, data, time.time())
+            self._maybe_flush()
+        return positions, aspects
+
+    def _maybe_flush(self):
+        # Caller holds the lock
+        if len(self._pending_positions) + len(self._pending_aspects) >= self.batch_size:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending_positions and not self._pending_aspects:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO positions (t, data, created) VALUES (?, ?, ?)",
+                list(self._pending_positions.values())
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO aspects (t, fingerprint, data, created) VALUES (?, ?, ?, ?)",
+                list(self._pending_aspects.values())
+            )
+        self._pending_positions = {}
+        self._pending_aspects = {}
+        self._evict_locked()
+
+    def flush(self):
+        """Writes pending inserts to disk."""
+        with self._lock:
+            self._flush_locked()
+
+    def size_bytes(self):
+        """
+        Bytes of the database pages in use, free pages left out.
+
+        This is what the size budget is checked against. Eviction vacuums the
+        free pages away, so the main file comes down to this size once the
+        WAL is checkpointed.
+        """
+        page_count = self._conn.execute("PRAGMA page_count").fetchone()[0]
+        page_size = self._conn.execute("PRAGMA page_size").fetchone()[0]
+        freelist = self._conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return (page_count - freelist) * page_size
+
+    def _evict_locked(self):
+        # Drop the oldest tenth of each table until the file fits the budget
+        while self.max_bytes and self.size_bytes() > self.max_bytes:
+            removed = 0
+            with self._conn:
+                for table in ("aspects", "positions"):
+                    count = self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                    if count == 0:
+                        continue
+                    offset = max(1, count // 10) - 1
+                    removed += self._conn.execute(
+                        f"DELETE FROM {table} WHERE created <= "
+                        f"(SELECT created FROM {table} ORDER BY created LIMIT 1 OFFSET ?)",
+                        (offset,)
+                    ).rowcount
+            if removed == 0:
+                break
+        if self._conn.execute("PRAGMA freelist_count").fetchone()[0]:
+            # Return the freed pages. Each step of the pragma frees one page and
+            # execute() stops after the first, so run it as a script
+            self._conn.executescript("PRAGMA incremental_vacuum")
+
+    def evict(self):
+        """Applies the size budget now."""
+        with self._lock:
+            self._evict_locked()
+
+    def clear(self):
+        """Removes every cached entry."""
+        with self._lock:
+            self._pending_positions = {}
+            self._pending_aspects = {}
+            with self._conn:
+                self._conn.execute("DELETE FROM positions")
+                self._conn.execute("DELETE FROM aspects")
+            self._conn.execute("VACUUM")
+
+    def stats(self):
+        """
+        Cache statistics.
+
+        Returns:
+            dict: {path, positions, aspects, rule_sets, size_bytes, max_bytes, hits, misses}
+        """
+        with self._lock:
+            self._flush_locked()
+            positions = self._conn.execute("SELECT COUNT(*) FROM positions").fetchone()[0]
+            aspects = self._conn.execute("SELECT COUNT(*) FROM aspects").fetchone()[0]
+            rule_sets = self._conn.execute("SELECT COUNT(DISTINCT fingerprint) FROM aspects").fetchone()[0]
+            size = self.size_bytes()
+        return {
+            "path": self.path,
+            "positions": positions,
+            "aspects": aspects,
+            "rule_sets": rule_sets,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def close(self):
+        """Flushes pending inserts and closes the connection."""
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the planetary results cache")
+    parser.add_argument("command", choices=["stats", "evict", "clear"])
+    parser.add_argument("--path", default=DEFAULT_CACHE_PATH, help="cache database file")
+    parser.add_argument("--max-mb", type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024),
+                        help="size budget used by evict")
+    args = parser.parse_args(argv)
+
+    with ResultCache(args.path, max_bytes=int(args.max_mb * 1024 * 1024)) as cache:
+        if args.command == "evict":
+            cache.evict()
+        elif args.command == "clear":
+            cache.clear()
+        for name, value in cache.stats().items():
+            if name in ("hits", "misses"):
+                continue
+            print(f"{name}: {value}")
+
+if __name__ == "__main__":
+    main()
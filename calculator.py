@@ -1,3 +1,4 @@
+import bisect
 import math
 
 # Default Aspect Rules
@@ -27,6 +28,77 @@ DEFAULT_ASPECT_RULES = {
     180: {"name": "Opposition", "trend": "Negative"}
 }
 
+# Below this many bodies checking every pair is cheaper than sorting
+SWEEP_MIN_BODIES = 16
+
+def _offset_windows(rules, orb):
+    """
+    Merged ranges of forward offsets (lon2 - lon1) mod 360 at which a pair
+    can match some rule angle, as sorted (low, high) pairs inside [0, 360].
+    """
+    # Widened slightly so rounding in the offset never drops a pair exactly at the orb edge
+    pad = orb + 1e-9
+    raw = []
+    for target_angle in rules.keys():
+        angle = float(target_angle)
+        for centre in (angle, 360.0 - angle):
+            low, high = centre - pad, centre + pad
+            # Split windows that wrap past 0 or 360
+            if low < 0.0:
+                raw.append((low + 360.0, 360.0))
+                low = 0.0
+            if high > 360.0:
+                raw.append((0.0, high - 360.0))
+                high = 360.0
+            raw.append((low, high))
+    
+    merged = []
+    for low, high in sorted(raw):
+        if merged and low <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], high))
+        else:
+            merged.append((low, high))
+    return merged
+
+def candidate_pairs(positions: dict, rules: dict = None, orb: float = 3.0):
+    """
+    Index pairs (i, j), i < j, of bodies in `positions` whose separation may
+    be within orb of a rule angle, in the same order as a full pair loop.
+    
+    Large body sets are swept: longitudes are sorted once and each body looks
+    up partners by bisecting the offset windows around it, so pairs that
+    cannot match are never visited.
+    
+    Returns:
+        list of tuples: [(i, j)]
+    """
+    if rules is None:
+        rules = DEFAULT_ASPECT_RULES
+    
+    n = len(positions)
+    if n < SWEEP_MIN_BODIES:
+        return [(i, j) for i in range(n) for j in range(i + 1, n)]
+    
+    windows = _offset_windows(rules, orb)
+    lons = [deg % 360.0 for deg in positions.values()]
+    order = sorted(range(n), key=lons.__getitem__)
+    
+    # Sorted longitudes twice round the circle so forward windows never wrap
+    ring = [lons[k] for k in order] + [lons[k] + 360.0 for k in order]
+    ring_index = order + order
+    
+    pairs = set()
+    for i in range(n):
+        base = lons[i]
+        for low, high in windows:
+            start = bisect.bisect_left(ring, base + low)
+            stop = bisect.bisect_right(ring, base + high)
+            for k in range(start, stop):
+                j = ring_index[k]
+                if j != i:
+                    pairs.add((i, j) if i < j else (j, i))
+    return sorted(pairs)
+
 def calculate_aspects(positions: dict, rules: dict = None, orb: float = 3.0, specific_rules: list = None, range_rules: list = None):
     """
     Identifies aspects between all pairs of planets.
@@ -53,65 +125,64 @@ def calculate_aspects(positions: dict, rules: dict = None, orb: float = 3.0, spe
     aspects_found = []
     planet_names = list(positions.keys())
     
-    # Iterate unique pairs
-    for i in range(len(planet_names)):
-        for j in range(i + 1, len(planet_names)):
-            p1 = planet_names[i]
-            p2 = planet_names[j]
-            
-            deg1 = positions[p1]
-            deg2 = positions[p2]
+    # Iterate unique pairs that can be within orb of some rule angle
+    for i, j in candidate_pairs(positions, rules, orb):
+        p1 = planet_names[i]
+        p2 = planet_names[j]
+        
+        deg1 = positions[p1]
+        deg2 = positions[p2]
+        
+        # Calculate angular difference (shortest distance on circle)
+        diff = abs(deg1 - deg2)
+        if diff > 180:
+            diff = 360 - diff
             
-            # Calculate angular difference (shortest distance on circle)
-            diff = abs(deg1 - deg2)
-            if diff > 180:
-                diff = 360 - diff
+        # Check against rules
+        for target_angle, info in rules.items():
+            # Check if diff is within orb of target_angle
+            if abs(diff - float(target_angle)) <= orb:
+                
+                # Default Trend
+                trend = info["trend"]
                 
-            # Check against rules
-            for target_angle, info in rules.items():
-                # Check if diff is within orb of target_angle
-                if abs(diff - float(target_angle)) <= orb:
+                # 1. Check for Specific Rule Override (Highest Priority)
+                specific_override = False
+                for s_rule in specific_rules:
+                    sp1 = s_rule.get("p1")
+                    sp2 = s_rule.get("p2")
+                    s_angle = s_rule.get("angle")
                     
-                    # Default Trend
-                    trend = info["trend"]
+                    planets_match = ({p1, p2} == {sp1, sp2})
+                    angle_match = (s_angle == target_angle)
                     
-                    # 1. Check for Specific Rule Override (Highest Priority)
-                    specific_override = False
-                    for s_rule in specific_rules:
-                        sp1 = s_rule.get("p1")
-                        sp2 = s_rule.get("p2")
-                        s_angle = s_rule.get("angle")
-                        
-                        planets_match = ({p1, p2} == {sp1, sp2})
-                        angle_match = (s_angle == target_angle)
+                    if planets_match and angle_match:
+                        trend = s_rule.get("trend")
+                        specific_override = True
+                        break
+                
+                # 2. Check for Range Rule Override (Medium Priority)
+                # Only if not overridden by specific rule
+                if not specific_override:
+                    for r_rule in range_rules:
+                        r_min = r_rule.get("min")
+                        r_max = r_rule.get("max")
                         
-                        if planets_match and angle_match:
-                            trend = s_rule.get("trend")
-                            specific_override = True
+                        if r_min <= diff <= r_max:
+                            trend = r_rule.get("trend")
                             break
-                    
-                    # 2. Check for Range Rule Override (Medium Priority)
-                    # Only if not overridden by specific rule
-                    if not specific_override:
-                        for r_rule in range_rules:
-                            r_min = r_rule.get("min")
-                            r_max = r_rule.get("max")
-                            
-                            if r_min <= diff <= r_max:
-                                trend = r_rule.get("trend")
-                                break
-                    
-                    aspects_found.append({
-                        "planet1": p1,
-                        "planet2": p2,
-                        "angle_deg": diff,
-                        "aspect_name": info["name"],
-                        "trend": trend,
-                        "orb_diff": abs(diff - float(target_angle)) # How exact it is
-                    })
-                    # Assuming only one aspect per pair (which is true for these standard angles)
-                    break
-                    
+                
+                aspects_found.append({
+                    "planet1": p1,
+                    "planet2": p2,
+                    "angle_deg": diff,
+                    "aspect_name": info["name"],
+                    "trend": trend,
+                    "orb_diff": abs(diff - float(target_angle)) # How exact it is
+                })
+                # Assuming only one aspect per pair (which is true for these standard angles)
+                break
+                
     return aspects_found
 
 def calculate_planet_summary(aspects: list):
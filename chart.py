@@ -0,0 +1,188 @@
+import copy
+import datetime
+import flet as ft
+import flet.canvas as cv
+from logic.calculator import DEFAULT_ASPECT_RULES
+
+# Colours cycled through for the separation curves
+SERIES_COLORS = ["blue", "red", "green", "orange", "purple", "teal", "brown", "pink"]
+
+# Visible spans the zoom buttons step through
+ZOOM_SPANS = [
+    datetime.timedelta(days=1),
+    datetime.timedelta(days=2),
+    datetime.timedelta(days=4),
+    datetime.timedelta(days=7),
+    datetime.timedelta(days=14),
+    datetime.timedelta(days=28),
+]
+
+class SeparationChart(ft.Column):
+    """
+    Angular separation of selected pairs over time, with the rule angles drawn
+    as horizontal guides.
+
+    The chart only holds the view (centre, span, pairs, pixel width). Whenever
+    the view changes it calls on_view_change(start, end, pairs, width); the
+    caller computes the downsampled curves and hands them to update_data.
+    """
+    def __init__(self, on_view_change, bodies, height=220, default_pairs=None):
+        super().__init__(spacing=5)
+        self.on_view_change = on_view_change
+        self.chart_height = height
+        self.pairs = list(default_pairs) if default_pairs else [("Sun", "Moon")]
+        self.rules = DEFAULT_ASPECT_RULES
+        self.center = datetime.datetime.now()
+        self.zoom = ZOOM_SPANS.index(datetime.timedelta(days=7))
+        self.width_px = 0
+        self.series = {}
+
+        self.canvas = cv.Canvas(
+            shapes=[],
+            height=height,
+            expand=True,
+            on_resize=self.on_canvas_resize
+        )
+
+        self.p1_dropdown = ft.Dropdown(
+            label="Planet 1",
+            options=[ft.dropdown.Option(p) for p in bodies],
+            width=130,
+            text_size=12
+        )
+        self.p2_dropdown = ft.Dropdown(
+            label="Planet 2",
+            options=[ft.dropdown.Option(p) for p in bodies],
+            width=130,
+            text_size=12
+        )
+        self.range_text = ft.Text("", size=12)
+        self.legend = ft.Row(wrap=True, spacing=10)
+
+        self.controls = [
+            ft.Row(
+                [
+                    ft.Text("Separation", size=20, weight=ft.FontWeight.BOLD),
+                    self.p1_dropdown,
+                    self.p2_dropdown,
+                    ft.IconButton(icon="add", tooltip="Add pair", on_click=self.add_pair),
+                    ft.IconButton(icon="clear_all", tooltip="Clear pairs", on_click=self.clear_pairs),
+                    ft.Container(expand=True),
+                    ft.IconButton(icon="chevron_left", tooltip="Earlier", on_click=lambda e: self.pan(-1)),
+                    ft.IconButton(icon="zoom_in", tooltip="Zoom in", on_click=lambda e: self.set_zoom(self.zoom - 1)),
+                    ft.IconButton(icon="zoom_out", tooltip="Zoom out", on_click=lambda e: self.set_zoom(self.zoom + 1)),
+                    ft.IconButton(icon="chevron_right", tooltip="Later", on_click=lambda e: self.pan(1)),
+                ],
+                wrap=True
+            ),
+            self.legend,
+            ft.Container(
+                content=self.canvas,
+                height=height,
+                border=ft.border.all(1, "grey300"),
+                border_radius=5
+            ),
+            self.range_text,
+        ]
+
+    # --- View ---
+
+    def view_range(self):
+        span = ZOOM_SPANS[self.zoom]
+        return self.center - span / 2, self.center + span / 2
+
+    def request_data(self):
+        # Nothing to fetch until the canvas has been laid out
+        if self.width_px <= 0:
+            return
+        start, end = self.view_range()
+        self.on_view_change(start, end, list(self.pairs), self.width_px)
+
+    def set_center(self, center: datetime.datetime):
+        if center == self.center:
+            return
+        self.center = center
+        self.request_data()
+
+    def set_zoom(self, zoom):
+        zoom = max(0, min(zoom, len(ZOOM_SPANS) - 1))
+        if zoom == self.zoom:
+            return
+        self.zoom = zoom
+        self.request_data()
+
+    def pan(self, direction):
+        # A quarter of the visible span per click
+        self.center += ZOOM_SPANS[self.zoom] / 4 * direction
+        self.request_data()
+
+    def set_rules(self, rules: dict):
+        # Called on every settings change; only redraw when the guide lines change
+        if rules == self.rules:
+            return
+        # Copied so an in-place edit of the caller's rules still counts as a change
+        self.rules = copy.deepcopy(rules)
+        self.redraw()
+
+    def on_canvas_resize(self, e):
+        width = int(e.width)
+        if width != self.width_px:
+            self.width_px = width
+            self.request_data()
+
+    # --- Pairs ---
+
+    def add_pair(self, e):
+        p1 = self.p1_dropdown.value
+        p2 = self.p2_dropdown.value
+        if not p1 or not p2 or p1 == p2:
+            return
+        if (p1, p2) in self.pairs or (p2, p1) in self.pairs:
+            return
+        self.pairs.append((p1, p2))
+        self.request_data()
+
+    def clear_pairs(self, e):
+        self.pairs = []
+        self.series = {}
+        self.redraw()
+
+    # --- Drawing ---
+
+    def update_data(self, series: dict):
+        """Takes {(planet1, planet2): [(datetime, separation)]} for the current view."""
+        self.series = series
+        self.redraw()
+
+    def redraw(self):
+        height = self.chart_height
+        width = max(self.width_px, 1)
+        start, end = self.view_range()
+        span_seconds = (end - start).total_seconds()
+
+        def y_of(deg):
+            return height - deg / 180.0 * height
+
+        shapes = []
+        # Rule angles as guides
+        for angle, info in self.rules.items():
+            y = y_of(float(angle))
+            shapes.append(cv.Line(0, y, width, y, paint=ft.Paint(color="grey300", stroke_width=1)))
+            shapes.append(cv.Text(2, y - 12, str(angle), ft.TextStyle(size=9, color="grey600")))
+
+        self.legend.controls = []
+        for k, (pair, points) in enumerate(self.series.items()):
+            color = SERIES_COLORS[k % len(SERIES_COLORS)]
+            elements = []
+            for n, (t, deg) in enumerate(points):
+                x = (t - start).total_seconds() / span_seconds * width
+                if n == 0:
+                    elements.append(cv.Path.MoveTo(x, y_of(deg)))
+                else:
+                    elements.append(cv.Path.LineTo(x, y_of(deg)))
+            shapes.append(cv.Path(elements, paint=ft.Paint(color=color, stroke_width=2, style=ft.PaintingStyle.STROKE)))
+            self.legend.controls.append(ft.Text(f"{pair[0]}–{pair[1]}", color=color, size=12))
+
+        self.canvas.shapes = shapes
+        self.range_text.value = f"{start.strftime('%Y-%m-%d %H:%M')}  →  {end.strftime('%Y-%m-%d %H:%M')}"
+        self.update()
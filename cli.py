@@ -0,0 +1,216 @@
+"""
+Headless batch interface: timestamps in, NDJSON positions/aspects out.
+
+Examples:
+    echo 2024-05-01T06:30:00 | python cli.py --rules rules.json
+    python cli.py --start 2024-01-01 --end 2024-02-01 --step 15m --workers 4 > out.ndjson
+
+Does not import flet, so it starts quickly and runs on servers without a display.
+"""
+import argparse
+import datetime
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from logic.ephemeris import get_planetary_positions, PRECISION_FULL, PRECISION_FAST, AYANAMSAS, DEFAULT_AYANAMSA
+from logic.calculator import calculate_aspects, calculate_planet_summary, DEFAULT_ASPECT_RULES
+from logic.patterns import compile_patterns, aspect_masks, match_patterns, DEFAULT_PATTERNS
+
+# Timestamps handed to the workers at a time; bounds memory on endless input
+BATCH_SIZE = 256
+
+# Output is flushed after this many lines so downstream readers see progress
+FLUSH_EVERY = 1000
+
+_STEP_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days"}
+
+def parse_timestamp(text: str):
+    """ISO 8601 datetime (naive means UTC) or Unix seconds, as a naive UTC datetime."""
+    text = text.strip()
+    try:
+        dt = datetime.datetime.fromtimestamp(float(text), datetime.timezone.utc)
+    except ValueError:
+        dt = datetime.datetime.fromisoformat(text)
+    # Always naive UTC, so both forms can be compared and mixed in a range
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return dt
+
+def parse_timestamp_arg(text: str):
+    """parse_timestamp for command-line arguments, where a bad value is a usage error."""
+    try:
+        return parse_timestamp(text)
+    except (ValueError, OverflowError, OSError):
+        raise argparse.ArgumentTypeError(f"Invalid timestamp: {text} (use ISO 8601 or Unix seconds)")
+
+def parse_step(text: str):
+    """Step such as 30s, 15m, 1h or 1d."""
+    unit = text[-1:].lower()
+    if unit not in _STEP_UNITS:
+        raise argparse.ArgumentTypeError(f"Invalid step: {text} (use e.g. 30s, 15m, 1h, 1d)")
+    step = datetime.timedelta(**{_STEP_UNITS[unit]: float(text[:-1])})
+    if step <= datetime.timedelta(0):
+        raise argparse.ArgumentTypeError("Step must be positive")
+    return step
+
+def load_rules(path: str = None):
+    """
+    Reads the rule set from a JSON file.
+
+    The file holds either the rules object exactly as edited in the
+    SettingsSidebar ({"30": {"name": ..., "trend": ...}, ...}) or an object
+    with "rules", "orb", "specific_rules", "range_rules" and "patterns" keys.
+
+    Returns:
+        dict: {rules, orb, specific_rules, range_rules, patterns}
+    """
+    settings = {"rules": DEFAULT_ASPECT_RULES, "orb": 3.0, "specific_rules": [], "range_rules": [],
+                "patterns": DEFAULT_PATTERNS}
+    if path is None:
+        return settings
+
+    with open(path) as f:
+        data = json.load(f)
+
+    if isinstance(data.get("rules"), dict):
+        rules = data["rules"]
+        settings["orb"] = float(data.get("orb", settings["orb"]))
+        settings["specific_rules"] = data.get("specific_rules", [])
+        settings["range_rules"] = data.get("range_rules", [])
+        settings["patterns"] = data.get("patterns", DEFAULT_PATTERNS)
+    else:
+        rules = data
+
+    # Convert keys to float for the logic layer (supports 22.3 etc)
+    settings["rules"] = {float(k): v for k, v in rules.items()}
+    return settings
+
+def iter_timestamps(args, stdin, stderr=sys.stderr):
+    """
+    Timestamps from --at, --start/--end/--step, or one per line on stdin.
+
+    A line that is not a timestamp is reported on stderr and skipped, so one
+    bad line does not end a long pipeline.
+    """
+    if args.at:
+        yield from args.at
+    elif args.start:
+        t = args.start
+        while t < args.end:
+            yield t
+            t += args.step
+    else:
+        for number, line in enumerate(stdin, 1):
+            if not line.strip():
+                continue
+            try:
+                dt = parse_timestamp(line)
+            except (ValueError, OverflowError, OSError) as e:
+                stderr.write(f"line {number}: skipped {line.strip()!r}: {e}\n")
+                continue
+            yield dt
+
+# Per-process settings, set once by _init_worker instead of pickled per task
+_settings = None
+
+def _init_worker(settings):
+    global _settings
+    _settings = settings
+
+def compute_record(dt: datetime.datetime, settings: dict = None):
+    """
+    One output record for an instant.
+
+    Returns:
+        str: JSON object {time, positions, aspects, summary, patterns}, limited to the requested fields
+    """
+    if settings is None:
+        settings = _settings
+    fields = settings["fields"]
+    record = {"time": dt.isoformat()}
+
+    positions = get_planetary_positions(dt, precision=settings["precision"], ayanamsa=settings["ayanamsa"])
+    if "positions" in fields:
+        record["positions"] = positions
+    if fields & {"aspects", "summary", "patterns"}:
+        aspects = calculate_aspects(positions, settings["rules"], settings["orb"],
+                                    settings["specific_rules"], settings["range_rules"])
+        if "aspects" in fields:
+            record["aspects"] = aspects
+        if "summary" in fields:
+            record["summary"] = calculate_planet_summary(aspects)
+        if "patterns" in fields:
+            bodies = list(positions)
+            masks = aspect_masks(aspects, bodies, settings["rules"])
+            record["patterns"] = match_patterns(masks, settings["compiled_patterns"], bodies)
+    return json.dumps(record, separators=(",", ":"))
+
+def run(args, stdin=sys.stdin, stdout=sys.stdout, stderr=sys.stderr):
+    settings = load_rules(args.rules)
+    if args.orb is not None:
+        settings["orb"] = args.orb
+    settings["precision"] = args.precision
+    settings["ayanamsa"] = args.ayanamsa
+    settings["fields"] = set(args.fields)
+    # Compiled once here so a bad pattern fails before any output
+    settings["compiled_patterns"] = compile_patterns(settings["patterns"], settings["rules"])
+
+    timestamps = iter_timestamps(args, stdin, stderr)
+    written = 0
+
+    def emit(lines):
+        nonlocal written
+        for line in lines:
+            stdout.write(line)
+            stdout.write("\n")
+            written += 1
+            if written % FLUSH_EVERY == 0:
+                stdout.flush()
+
+    if args.workers <= 1:
+        _init_worker(settings)
+        emit(compute_record(dt) for dt in timestamps)
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(settings,)) as pool:
+            chunksize = max(1, BATCH_SIZE // (args.workers * 4))
+            while True:
+                # Read a bounded batch so unbounded input keeps memory constant
+                batch = list(itertools.islice(timestamps, BATCH_SIZE))
+                if not batch:
+                    break
+                emit(pool.map(compute_record, batch, chunksize=chunksize))
+    stdout.flush()
+    return written
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Planetary positions and aspects as NDJSON")
+    parser.add_argument("--at", nargs="+", type=parse_timestamp_arg, help="timestamps (ISO 8601 or Unix seconds)")
+    parser.add_argument("--start", type=parse_timestamp_arg, help="range start, used with --end and --step")
+    parser.add_argument("--end", type=parse_timestamp_arg, help="range end (exclusive)")
+    parser.add_argument("--step", type=parse_step, default=parse_step("1h"), help="range step, e.g. 15m")
+    parser.add_argument("--rules", help="rules JSON file (SettingsSidebar format)")
+    parser.add_argument("--orb", type=float, default=None, help="override the orb from the rules file")
+    parser.add_argument("--precision", choices=[PRECISION_FULL, PRECISION_FAST], default=PRECISION_FULL)
+    parser.add_argument("--ayanamsa", choices=list(AYANAMSAS), default=DEFAULT_AYANAMSA)
+    parser.add_argument("--fields", nargs="+", choices=["positions", "aspects", "summary", "patterns"],
+                        default=["positions", "aspects", "summary"])
+    parser.add_argument("--workers", type=int, default=1, help="worker processes")
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.start and not args.end:
+        parser.error("--start needs --end")
+    try:
+        run(args)
+    except BrokenPipeError:
+        # Downstream closed early (e.g. piped into head); silence the final flush
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,9 +5,15 @@ from pymeeus.Venus import Venus
 from pymeeus.Mars import Mars
 from pymeeus.Jupiter import Jupiter
 from pymeeus.Saturn import Saturn
+from pymeeus.Uranus import Uranus
+from pymeeus.Neptune import Neptune
+from pymeeus.Pluto import Pluto
 from pymeeus.Epoch import Epoch
 from pymeeus.Coordinates import equatorial2ecliptical, true_obliquity
 import datetime
+import functools
+import math
+from logic.fast_ephemeris import fast_tropical_longitudes, ELEMENTS as _FAST_ELEMENTS
 
 # Lahiri ayanamsa calculation using exact Drik Panchang values
 def get_ayanamsa(jd):
@@ -34,80 +40,327 @@ def get_ayanamsa(jd):
     
     return ayanamsa
 
-def get_planetary_positions(dt: datetime.datetime, lat: float = 0.0, lon: float = 0.0):
+def _linear_ayanamsa(reference_jd, reference_deg, precession_arcsec_per_year):
+    """Ayanamsa growing linearly from a reference value, like get_ayanamsa."""
+    def ayanamsa(jd):
+        return reference_deg + ((jd - reference_jd) / 365.25) * (precession_arcsec_per_year / 3600.0)
+    return ayanamsa
+
+# Registry of ayanamsa models: name -> function(jd) returning degrees.
+# "lahiri" keeps the Drik Panchang constants above; Raman and Krishnamurti
+# use their J1900 values with the IAU 2006 general precession rate.
+AYANAMSAS = {
+    "lahiri": get_ayanamsa,
+    "raman": _linear_ayanamsa(2415020.0, 21.014722, 50.28796),
+    "kp": _linear_ayanamsa(2415020.0, 22.363889, 50.28796),
+    "tropical": lambda jd: 0.0,
+}
+
+DEFAULT_AYANAMSA = "lahiri"
+
+# Instants whose tropical positions are kept in memory
+TROPICAL_CACHE_SIZE = 4096
+
+# Bodies returned by get_planetary_positions, in output order
+PLANETS = ["Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Rahu", "Ketu"]
+
+# Precision levels accepted by get_planetary_positions
+PRECISION_FULL = "full"   # pymeeus series, the reference result
+PRECISION_FAST = "fast"   # Keplerian elements, within ~0.1°, for interactive previews
+
+# Bodies the fast precision level covers itself
+FAST_BODIES = set(_FAST_ELEMENTS)
+
+# Optional bodies that can be added to the default set
+OUTER_PLANETS = ["Uranus", "Neptune", "Pluto"]
+CHART_POINTS = ["Ascendant", "Midheaven"]
+
+# Fixed stars: name -> tropical ecliptic longitude at J2000 (degrees)
+FIXED_STARS = {
+    "Algol": 56.17,
+    "Aldebaran": 69.79,
+    "Sirius": 104.08,
+    "Pollux": 113.22,
+    "Regulus": 149.83,
+    "Spica": 203.84,
+    "Antares": 249.77,
+    "Fomalhaut": 333.87,
+}
+
+# Fixed stars drift with general precession (arcsec per year)
+_STAR_PRECESSION_ARCSEC_PER_YEAR = 50.28796
+
+# Planets whose geocentric position comes back as equatorial (RA/Dec)
+_EQUATORIAL_BODIES = {
+    "Mercury": Mercury,
+    "Venus": Venus,
+    "Mars": Mars,
+    "Jupiter": Jupiter,
+    "Saturn": Saturn,
+    "Uranus": Uranus,
+    "Neptune": Neptune,
+    "Pluto": Pluto,
+}
+
+# Bodies added with register_body: name -> function(jd) giving tropical degrees
+_CUSTOM_BODIES = {}
+
+def register_body(name: str, tropical_longitude):
+    """
+    Adds a body (asteroid, hypothetical point, ...) usable in any body set.
+    
+    Args:
+        name: display name, must not clash with a built-in body
+        tropical_longitude: function(jd) returning the tropical longitude in degrees
+    """
+    if name in available_bodies():
+        raise ValueError(f"Body already defined: {name}")
+    _CUSTOM_BODIES[name] = tropical_longitude
+
+def unregister_body(name: str):
+    """Removes a body added with register_body."""
+    if name not in _CUSTOM_BODIES:
+        raise ValueError(f"Body not registered: {name}")
+    del _CUSTOM_BODIES[name]
+    # Cached positions of the old body must not be served if the name is registered again
+    _tropical_positions.cache_clear()
+
+def available_bodies():
+    """Every body name get_planetary_positions accepts in `bodies`."""
+    return PLANETS + OUTER_PLANETS + CHART_POINTS + list(FIXED_STARS) + list(_CUSTOM_BODIES)
+
+def _chart_point(body, jd, epsilon, lat, lon):
+    """Ascendant or Midheaven (tropical degrees) for an observer."""
+    # Greenwich mean sidereal time plus east longitude gives the local sidereal time
+    t = (jd - 2451545.0) / 36525.0
+    gmst = 280.46061837 + 360.98564736629 * (jd - 2451545.0) + 0.000387933 * t * t
+    lst = math.radians((gmst + lon) % 360.0)
+    eps = math.radians(float(epsilon))
+    
+    if body == "Midheaven":
+        return math.degrees(math.atan2(math.sin(lst), math.cos(lst) * math.cos(eps))) % 360.0
+    
+    phi = math.radians(lat)
+    asc = math.atan2(math.cos(lst), -(math.sin(lst) * math.cos(eps) + math.tan(phi) * math.sin(eps)))
+    return math.degrees(asc) % 360.0
+
+def get_julian_day(dt: datetime.datetime):
     """
-    Calculates sidereal planetary positions (Lahiri Ayanamsha) for a given datetime.
+    Julian Day used by get_planetary_positions for a datetime.
     
     Args:
         dt: datetime object (timezone aware or naive, if naive assumed UTC)
-        lat: Latitude (observer)
-        lon: Longitude (observer)
         
     Returns:
-        dict: {PlanetName: Degree (0-360)}
+        float: Julian Day
     """
-    
     # Convert to UTC if timezone aware
     if dt.tzinfo:
         dt = dt.astimezone(datetime.timezone.utc)
     
     # Create PyMeeus Epoch object
     epoch = Epoch(dt.year, dt.month, dt.day + dt.hour/24.0 + dt.minute/1440.0 + dt.second/86400.0)
+    return epoch.jde()
+
+def julian_day_to_datetime(jd):
+    """Converts a Julian Day back to a naive UTC datetime."""
+    return datetime.datetime(2000, 1, 1, 12) + datetime.timedelta(days=jd - 2451545.0)
+
+def _tropical_longitude(body, epoch, jd, epsilon, lat=0.0, lon=0.0):
+    """Tropical longitude of one body, sharing the per-instant epoch values."""
+    if body == "Sun":
+        # Uses apparent_geocentric_position which returns ecliptical coords
+        sun_lon, sun_lat, sun_dist = Sun.apparent_geocentric_position(epoch)
+        return float(sun_lon) % 360.0
     
-    # Get Julian Day
-    jd = epoch.jde()
+    if body == "Moon":
+        # Returns 4 values: (lon, lat, dist, parallax) already in ecliptical coords
+        moon_lon, moon_lat, moon_dist, moon_parallax = Moon.apparent_ecliptical_pos(epoch)
+        return float(moon_lon) % 360.0
+    
+    if body in _EQUATORIAL_BODIES:
+        # geocentric_position returns equatorial (RA/Dec), convert to ecliptical
+        # (Pluto returns only RA/Dec)
+        ra, dec = _EQUATORIAL_BODIES[body].geocentric_position(epoch)[:2]
+        planet_lon, planet_lat = equatorial2ecliptical(ra, dec, epsilon)
+        return float(planet_lon) % 360.0
+    
+    if body in CHART_POINTS:
+        return _chart_point(body, jd, epsilon, lat, lon)
+    
+    if body in FIXED_STARS:
+        years_since_2000 = (jd - 2451545.0) / 365.25
+        return (FIXED_STARS[body] + years_since_2000 * _STAR_PRECESSION_ARCSEC_PER_YEAR / 3600.0) % 360.0
+    
+    if body in _CUSTOM_BODIES:
+        return float(_CUSTOM_BODIES[body](jd)) % 360.0
+    
+    # Calculate Rahu (North Node of Moon) - Mean Node
+    # Using simplified calculation
+    years_since_2000 = (jd - 2451545.0) / 365.25
+    # The formula gives the tropical mean node; sidereal systems subtract their offset
+    rahu_mean = (125.04 - years_since_2000 * 19.3) % 360.0
+    
+    if body == "Rahu":
+        return rahu_mean % 360.0
+    
+    if body == "Ketu":
+        # Ketu is opposite to Rahu
+        return (rahu_mean + 180.0) % 360.0
+    
+    raise ValueError(f"Unknown body: {body}")
+
+_DEFAULT_BODY_KEY = tuple(PLANETS)
+
+# Bodies that need the obliquity of the ecliptic
+_NEEDS_OBLIQUITY = set(_EQUATORIAL_BODIES) | set(CHART_POINTS)
+
+@functools.lru_cache(maxsize=TROPICAL_CACHE_SIZE)
+def _tropical_positions(jd, precision, bodies=_DEFAULT_BODY_KEY, lat=0.0, lon=0.0):
+    """Tropical longitudes of `bodies` at jd as an immutable tuple, cached per instant."""
+    epoch = Epoch(jd)
     
-    # Calculate ayanamsa
-    ayanamsa = get_ayanamsa(jd)
+    if precision == PRECISION_FAST:
+        fast = fast_tropical_longitudes(jd, [b for b in bodies if b in FAST_BODIES])
+    elif precision == PRECISION_FULL:
+        fast = {}
+    else:
+        raise ValueError(f"Unknown precision: {precision}")
     
     # Get obliquity of ecliptic for coordinate conversion
-    epsilon = true_obliquity(epoch)
+    epsilon = None
+    if any(b in _NEEDS_OBLIQUITY and b not in fast for b in bodies):
+        epsilon = true_obliquity(epoch)
     
-    results = {}
+    # Bodies without a fast path (nodes, outer planets, ...) are computed in full
+    return tuple(fast[body] if body in fast else _tropical_longitude(body, epoch, jd, epsilon, lat, lon)
+                 for body in bodies)
+
+def _body_key(bodies):
+    """Body list as a hashable cache key, checked against the known bodies."""
+    if bodies is None:
+        return _DEFAULT_BODY_KEY
+    bodies = tuple(bodies)
+    unknown = set(bodies) - set(available_bodies())
+    if unknown:
+        raise ValueError(f"Unknown bodies: {', '.join(sorted(unknown))}")
+    return bodies
+
+def _observer_key(bodies, lat, lon):
+    """(lat, lon) only matters for chart points; dropping it otherwise keeps cache hits."""
+    if any(b in CHART_POINTS for b in bodies):
+        return float(lat), float(lon)
+    return 0.0, 0.0
+
+def apply_ayanamsa(tropical: dict, jd: float, ayanamsa: str = DEFAULT_AYANAMSA):
+    """
+    Converts tropical longitudes to a sidereal system with one offset.
+    
+    Args:
+        tropical: {PlanetName: tropical Degree}
+        jd: Julian Day the longitudes belong to
+        ayanamsa: name from AYANAMSAS
+        
+    Returns:
+        dict: {PlanetName: Degree (0-360)}
+    """
+    offset = AYANAMSAS[ayanamsa](jd)
+    return {body: (deg - offset) % 360.0 for body, deg in tropical.items()}
+
+def get_tropical_positions(dt: datetime.datetime, precision: str = PRECISION_FULL, bodies: list = None,
+                           lat: float = 0.0, lon: float = 0.0):
+    """
+    Tropical planetary positions, computed once per instant and cached.
     
-    # Sun - Uses apparent_geocentric_position which returns ecliptical coords
-    sun_lon, sun_lat, sun_dist = Sun.apparent_geocentric_position(epoch)
-    results['Sun'] = (float(sun_lon) - ayanamsa) % 360.0
+    Returns:
+        dict: {PlanetName: Degree (0-360)}
+    """
+    bodies = _body_key(bodies)
+    return dict(zip(bodies, _tropical_positions(get_julian_day(dt), precision, bodies, *_observer_key(bodies, lat, lon))))
+
+def get_sidereal_longitude(body: str, jd: float, ayanamsa: str = DEFAULT_AYANAMSA):
+    """
+    Sidereal longitude of a single body at a Julian Day.
     
-    # Moon - Returns 4 values: (lon, lat, dist, parallax) already in ecliptical coords
-    moon_lon, moon_lat, moon_dist, moon_parallax = Moon.apparent_ecliptical_pos(epoch)
-    results['Moon'] = (float(moon_lon) - ayanamsa) % 360.0
+    Cheaper than get_planetary_positions when only one body is needed,
+    e.g. when refining the time of an event.
     
-    # Mercury - geocentric_position returns equatorial (RA/Dec), convert to ecliptical
-    ra, dec, dist = Mercury.geocentric_position(epoch)
-    mercury_lon, mercury_lat = equatorial2ecliptical(ra, dec, epsilon)
-    results['Mercury'] = (float(mercury_lon) - ayanamsa) % 360.0
+    Args:
+        body: one of available_bodies() (chart points use lat/lon 0)
+        jd: Julian Day (as returned by get_julian_day)
+        ayanamsa: name from AYANAMSAS
+        
+    Returns:
+        float: Degree (0-360)
+    """
+    epoch = Epoch(jd)
+    epsilon = true_obliquity(epoch) if body in _NEEDS_OBLIQUITY else None
+    return (_tropical_longitude(body, epoch, jd, epsilon) - AYANAMSAS[ayanamsa](jd)) % 360.0
+
+def get_planetary_positions(dt: datetime.datetime, lat: float = 0.0, lon: float = 0.0,
+                            precision: str = PRECISION_FULL, ayanamsa: str = DEFAULT_AYANAMSA,
+                            bodies: list = None):
+    """
+    Calculates sidereal planetary positions (Lahiri Ayanamsha by default) for a given datetime.
     
-    # Venus
-    ra, dec, dist = Venus.geocentric_position(epoch)
-    venus_lon, venus_lat = equatorial2ecliptical(ra, dec, epsilon)
-    results['Venus'] = (float(venus_lon) - ayanamsa) % 360.0
+    The tropical positions are cached per instant, so asking for another
+    ayanamsa at the same time only costs the offset.
     
-    # Mars
-    ra, dec, dist = Mars.geocentric_position(epoch)
-    mars_lon, mars_lat = equatorial2ecliptical(ra, dec, epsilon)
-    results['Mars'] = (float(mars_lon) - ayanamsa) % 360.0
+    Args:
+        dt: datetime object (timezone aware or naive, if naive assumed UTC)
+        lat: Latitude (observer)
+        lon: Longitude (observer)
+        precision: PRECISION_FULL (default) or PRECISION_FAST
+        ayanamsa: name from AYANAMSAS, "tropical" for no offset
+        bodies: names from available_bodies(), defaults to PLANETS
+        
+    Returns:
+        dict: {PlanetName: Degree (0-360)}
+    """
     
-    # Jupiter
-    ra, dec, dist = Jupiter.geocentric_position(epoch)
-    jupiter_lon, jupiter_lat = equatorial2ecliptical(ra, dec, epsilon)
-    results['Jupiter'] = (float(jupiter_lon) - ayanamsa) % 360.0
+    # Get Julian Day
+    jd = get_julian_day(dt)
     
-    # Saturn
-    ra, dec, dist = Saturn.geocentric_position(epoch)
-    saturn_lon, saturn_lat = equatorial2ecliptical(ra, dec, epsilon)
-    results['Saturn'] = (float(saturn_lon) - ayanamsa) % 360.0
+    bodies = _body_key(bodies)
+    tropical = dict(zip(bodies, _tropical_positions(jd, precision, bodies, *_observer_key(bodies, lat, lon))))
+    return apply_ayanamsa(tropical, jd, ayanamsa)
+
+def get_positions_by_ayanamsa(dt: datetime.datetime, ayanamsas: list = None, precision: str = PRECISION_FULL,
+                              bodies: list = None):
+    """
+    Positions in several systems side by side, paying for the ephemeris once.
     
-    # Calculate Rahu (North Node of Moon) - Mean Node
-    # Using simplified calculation
-    years_since_2000 = (jd - 2451545.0) / 365.25
-    rahu_mean = (125.04 - years_since_2000 * 19.3) % 360.0
-    results['Rahu'] = rahu_mean
+    Returns:
+        dict: {ayanamsa name: {PlanetName: Degree (0-360)}}
+    """
+    if ayanamsas is None:
+        ayanamsas = list(AYANAMSAS.keys())
+    jd = get_julian_day(dt)
+    bodies = _body_key(bodies)
+    tropical = dict(zip(bodies, _tropical_positions(jd, precision, bodies, *_observer_key(bodies, 0.0, 0.0))))
+    return {name: apply_ayanamsa(tropical, jd, name) for name in ayanamsas}
+
+def get_position_series(dts: list, precision: str = PRECISION_FULL, ayanamsa: str = DEFAULT_AYANAMSA,
+                        bodies: list = None, lat: float = 0.0, lon: float = 0.0):
+    """
+    Positions at many instants in one call, one list per body.
     
-    # Ketu is opposite to Rahu
-    results['Ketu'] = (rahu_mean + 180.0) % 360.0
+    Bypasses the per-instant cache, so long sweeps (charts, exports) do not
+    evict the instants the user is looking at.
     
-    return results
+    Returns:
+        dict: {PlanetName: [Degree (0-360) per instant]}
+    """
+    bodies = _body_key(bodies)
+    observer = _observer_key(bodies, lat, lon)
+    offset_of = AYANAMSAS[ayanamsa]
+    columns = {body: [] for body in bodies}
+    for dt in dts:
+        jd = get_julian_day(dt)
+        offset = offset_of(jd)
+        for body, deg in zip(bodies, _tropical_positions.__wrapped__(jd, precision, bodies, *observer)):
+            columns[body].append((deg - offset) % 360.0)
+    return columns
 
 def format_degree(deg):
     """Converts decimal degree to DMS string or just rounded."""
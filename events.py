@@ -0,0 +1,225 @@
+import datetime
+import heapq
+from logic.ephemeris import PLANETS, get_julian_day, get_sidereal_longitude, julian_day_to_datetime
+
+# Sidereal sign (rashi) names, 30° each starting from 0°
+SIGNS = [
+    "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+    "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"
+]
+
+# Nakshatra names, 13°20' each starting from 0°
+NAKSHATRAS = [
+    "Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashira", "Ardra",
+    "Punarvasu", "Pushya", "Ashlesha", "Magha", "Purva Phalguni", "Uttara Phalguni",
+    "Hasta", "Chitra", "Swati", "Vishakha", "Anuradha", "Jyeshtha",
+    "Mula", "Purva Ashadha", "Uttara Ashadha", "Shravana", "Dhanishta", "Shatabhisha",
+    "Purva Bhadrapada", "Uttara Bhadrapada", "Revati"
+]
+
+# Zodiac divisions searched for ingresses: kind -> (width in degrees, names)
+DIVISIONS = {
+    "sign": (30.0, SIGNS),
+    "nakshatra": (360.0 / 27.0, NAKSHATRAS),
+}
+
+# Sampling step per body in days. Each step must be shorter than the time the
+# body needs to cover half a circle and shorter than the gap between two of its
+# stations, so one sample interval holds at most one station.
+SAMPLE_STEP_DAYS = {
+    "Sun": 2.0,
+    "Moon": 0.5,
+    "Mercury": 1.0,
+    "Venus": 2.0,
+    "Mars": 2.0,
+    "Jupiter": 4.0,
+    "Saturn": 4.0,
+    "Rahu": 10.0,
+    "Ketu": 10.0,
+}
+
+# Bodies that can station. The Sun and Moon never retrograde and the mean nodes
+# always move backwards at a constant rate.
+STATION_BODIES = {"Mercury", "Venus", "Mars", "Jupiter", "Saturn"}
+
+# Events are searched in windows of this many days so output streams lazily
+CHUNK_DAYS = 30.0
+
+# Half-width of the central difference used for longitudinal speed
+SPEED_DELTA_DAYS = 0.01
+
+def _wrap(deg):
+    """Wraps an angle into [-180, 180)."""
+    return (deg + 180.0) % 360.0 - 180.0
+
+def _refine_root(f, t0, t1, f0, f1, tolerance):
+    """
+    Finds a root of f inside [t0, t1] where f0 and f1 have opposite signs.
+    Uses the Illinois variant of regula falsi, which keeps the bracket and
+    converges superlinearly on smooth functions.
+    """
+    side = 0
+    while abs(t1 - t0) > tolerance:
+        t = t1 - f1 * (t1 - t0) / (f1 - f0)
+        # Guard against the estimate sitting on a bracket end
+        if not (min(t0, t1) < t < max(t0, t1)):
+            t = 0.5 * (t0 + t1)
+        ft = f(t)
+        if ft == 0.0:
+            return t
+        if (ft > 0) == (f1 > 0):
+            t1, f1 = t, ft
+            if side == -1:
+                f0 *= 0.5
+            side = -1
+        else:
+            t0, f0 = t, ft
+            if side == 1:
+                f1 *= 0.5
+            side = 1
+    return 0.5 * (t0 + t1)
+
+class _Evaluator:
+    """Wraps get_sidereal_longitude and counts ephemeris evaluations."""
+    def __init__(self, body, stats):
+        self.body = body
+        self.stats = stats
+
+    def longitude(self, jd):
+        if self.stats is not None:
+            self.stats["evaluations"] = self.stats.get("evaluations", 0) + 1
+        return get_sidereal_longitude(self.body, jd)
+
+    def speed(self, jd):
+        """Longitudinal speed in degrees per day."""
+        h = SPEED_DELTA_DAYS
+        return _wrap(self.longitude(jd + h) - self.longitude(jd - h)) / (2.0 * h)
+
+def _make_event(body, jd, event, longitude, **extra):
+    event_dict = {
+        "time": julian_day_to_datetime(jd),
+        "jd": jd,
+        "planet": body,
+        "event": event,
+        "longitude": longitude % 360.0,
+    }
+    event_dict.update(extra)
+    return event_dict
+
+def _crossings(calc, jd0, lon0, jd1, lon1, kinds, tolerance):
+    """
+    Ingress events in [jd0, jd1] where longitude is monotonic.
+    lon0 and lon1 are unwrapped so that lon1 - lon0 is the true motion.
+    """
+    found = []
+    if lon0 == lon1:
+        return found
+    forward = lon1 > lon0
+    low, high = min(lon0, lon1), max(lon0, lon1)
+
+    for kind in kinds:
+        width, names = DIVISIONS[kind]
+        # Boundaries strictly after the start and up to and including the end
+        k = int(low // width) + 1 if forward else int(-(-low // width))
+        while True:
+            boundary = k * width
+            if forward and boundary > high:
+                break
+            if not forward and boundary >= high:
+                break
+
+            def offset(jd, b=boundary):
+                return _wrap(calc.longitude(jd) - b)
+
+            f0 = lon0 - boundary
+            f1 = lon1 - boundary
+            if f1 == 0.0:
+                jd = jd1
+            else:
+                jd = _refine_root(offset, jd0, jd1, f0, f1, tolerance)
+
+            index = k % len(names)
+            previous = (index - 1) % len(names)
+            from_index, to_index = (previous, index) if forward else (index, previous)
+            found.append(_make_event(
+                calc.body, jd, f"{kind}_ingress", boundary,
+                **{"from": names[from_index], "to": names[to_index], "retrograde": not forward}
+            ))
+            k += 1
+
+    return found
+
+def _body_events(body, jd_start, jd_end, kinds, tolerance, stats):
+    """Yields one body's events in chronological order, chunk by chunk."""
+    calc = _Evaluator(body, stats)
+    step = SAMPLE_STEP_DAYS.get(body, 1.0)
+    ingress_kinds = [k for k in kinds if k in DIVISIONS]
+    find_stations = "station" in kinds and body in STATION_BODIES
+    # Station times are only needed to split intervals for ingresses too
+    track_speed = body in STATION_BODIES and (find_stations or ingress_kinds)
+
+    jd = jd_start
+    lon = calc.longitude(jd)
+    speed = calc.speed(jd) if track_speed else None
+
+    while jd < jd_end:
+        chunk_end = min(jd + CHUNK_DAYS, jd_end)
+        chunk_events = []
+
+        while jd < chunk_end:
+            next_jd = min(jd + step, chunk_end)
+            next_lon = lon + _wrap(calc.longitude(next_jd) - lon)
+            next_speed = calc.speed(next_jd) if track_speed else None
+
+            # Split the interval at a station so each piece is monotonic
+            pieces = [(jd, lon, next_jd, next_lon)]
+            if track_speed and (speed > 0) != (next_speed > 0):
+                station_jd = _refine_root(calc.speed, jd, next_jd, speed, next_speed, tolerance)
+                station_lon = lon + _wrap(calc.longitude(station_jd) - lon)
+                pieces = [(jd, lon, station_jd, station_lon), (station_jd, station_lon, next_jd, next_lon)]
+                if find_stations:
+                    event = "station_retrograde" if speed > 0 else "station_direct"
+                    chunk_events.append(_make_event(body, station_jd, event, station_lon))
+
+            if ingress_kinds:
+                for piece in pieces:
+                    chunk_events.extend(_crossings(calc, *piece, ingress_kinds, tolerance))
+
+            jd, lon, speed = next_jd, next_lon, next_speed
+
+        chunk_events.sort(key=lambda e: e["jd"])
+        yield from chunk_events
+
+def find_events(start: datetime.datetime, end: datetime.datetime, bodies: list = None, kinds: list = None,
+                tolerance_seconds: float = 0.5, stats: dict = None):
+    """
+    Streams sign/nakshatra ingresses and retrograde/direct stations.
+
+    Each body is sampled at a coarse step, events are bracketed between
+    samples and then refined by root finding on (longitude - boundary) or
+    on longitudinal speed, so the number of ephemeris evaluations grows
+    with the number of events rather than with the timing precision.
+
+    Args:
+        start: datetime (timezone aware or naive, if naive assumed UTC)
+        end: datetime, exclusive end of the search range
+        bodies: list of planet names, defaults to all PLANETS
+        kinds: any of "sign", "nakshatra", "station" (default: all)
+        tolerance_seconds: timing precision of the refined events
+        stats: optional dict, receives the "evaluations" count
+
+    Yields:
+        dict: {time, jd, planet, event, longitude, ...} in time order.
+        Ingresses also carry from, to and retrograde.
+    """
+    if bodies is None:
+        bodies = PLANETS
+    if kinds is None:
+        kinds = ["sign", "nakshatra", "station"]
+
+    jd_start = get_julian_day(start)
+    jd_end = get_julian_day(end)
+    tolerance = tolerance_seconds / 86400.0
+
+    streams = [_body_events(body, jd_start, jd_end, kinds, tolerance, stats) for body in bodies]
+    yield from heapq.merge(*streams, key=lambda e: e["jd"])
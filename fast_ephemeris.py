@@ -0,0 +1,181 @@
+import math
+from logic.moon_engine import MoonEngine
+
+# Low-precision planetary positions from Keplerian mean elements of date.
+#
+# Elements and perturbation terms follow Paul Schlyter's "How to compute
+# planetary positions". Longitudes are tropical, referred to the mean equinox
+# of date, and are good to a few arcminutes between roughly 1800 and 2100,
+# which is plenty for previews while the full pymeeus result is computed.
+
+# Error bound of each fast longitude against the full path, in degrees, about
+# 1.5 times the worst error seen between 1800 and 2100. An aspect classification
+# closer than the pair's summed bounds to an orb edge is not trusted.
+FAST_ERROR_DEG = {
+    "Sun": 0.015,
+    "Moon": 0.01,
+    "Mercury": 0.03,
+    "Venus": 0.04,
+    "Mars": 0.08,
+    "Jupiter": 0.06,
+    "Saturn": 0.1,
+}
+
+# Worst-case error of any fast longitude
+FAST_MAX_ERROR_DEG = max(FAST_ERROR_DEG.values())
+
+# The Moon comes from the truncated ELP series instead of its Keplerian
+# orbit, which would need many more perturbation terms to get this close
+_MOON = MoonEngine(max_error_deg=0.01)
+
+# Orbital elements as (base, rate per day) measured from JD 2451543.5:
+# N longitude of ascending node, i inclination, w argument of perihelion,
+# a semi-major axis (AU, Earth radii for the Moon), e eccentricity, M mean anomaly
+ELEMENTS = {
+    "Sun": {
+        "N": (0.0, 0.0), "i": (0.0, 0.0), "w": (282.9404, 4.70935e-5),
+        "a": (1.0, 0.0), "e": (0.016709, -1.151e-9), "M": (356.0470, 0.9856002585),
+    },
+    "Moon": {
+        "N": (125.1228, -0.0529538083), "i": (5.1454, 0.0), "w": (318.0634, 0.1643573223),
+        "a": (60.2666, 0.0), "e": (0.054900, 0.0), "M": (115.3654, 13.0649929509),
+    },
+    "Mercury": {
+        "N": (48.3313, 3.24587e-5), "i": (7.0047, 5.00e-8), "w": (29.1241, 1.01444e-5),
+        "a": (0.387098, 0.0), "e": (0.205635, 5.59e-10), "M": (168.6562, 4.0923344368),
+    },
+    "Venus": {
+        "N": (76.6799, 2.46590e-5), "i": (3.3946, 2.75e-8), "w": (54.8910, 1.38374e-5),
+        "a": (0.723330, 0.0), "e": (0.006773, -1.302e-9), "M": (48.0052, 1.6021302244),
+    },
+    "Mars": {
+        "N": (49.5574, 2.11081e-5), "i": (1.8497, -1.78e-8), "w": (286.5016, 2.92961e-5),
+        "a": (1.523688, 0.0), "e": (0.093405, 2.516e-9), "M": (18.6021, 0.5240207766),
+    },
+    "Jupiter": {
+        "N": (100.4542, 2.76854e-5), "i": (1.3030, -1.557e-7), "w": (273.8777, 1.64505e-5),
+        "a": (5.20256, 0.0), "e": (0.048498, 4.469e-9), "M": (19.8950, 0.0830853001),
+    },
+    "Saturn": {
+        "N": (113.6634, 2.38980e-5), "i": (2.4886, -1.081e-7), "w": (339.3939, 2.97661e-5),
+        "a": (9.55475, 0.0), "e": (0.055546, -9.499e-9), "M": (316.9670, 0.0334442282),
+    },
+}
+
+# Day number zero of the elements (2000 Jan 0.0 TT)
+_ELEMENTS_EPOCH_JD = 2451543.5
+
+# Annual aberration shifts every body but the Moon back by about 20.5"
+_ABERRATION_DEG = -20.4898 / 3600.0
+
+_D2R = math.pi / 180.0
+_R2D = 180.0 / math.pi
+
+def _element(body, name, d):
+    base, rate = ELEMENTS[body][name]
+    return base + rate * d
+
+def _solve_kepler(M, e):
+    """Eccentric anomaly (radians) for mean anomaly M (radians)."""
+    E = M + e * math.sin(M) * (1.0 + e * math.cos(M))
+    for _ in range(5):
+        delta = (E - e * math.sin(E) - M) / (1.0 - e * math.cos(E))
+        E -= delta
+        if abs(delta) < 1e-10:
+            break
+    return E
+
+def _orbit_position(body, d, M=None):
+    """Ecliptic rectangular position in the body's own orbit (heliocentric, or geocentric for Sun/Moon)."""
+    N = _element(body, "N", d) * _D2R
+    i = _element(body, "i", d) * _D2R
+    w = _element(body, "w", d) * _D2R
+    a = _element(body, "a", d)
+    e = _element(body, "e", d)
+    if M is None:
+        M = _element(body, "M", d) * _D2R
+
+    E = _solve_kepler(M, e)
+    xv = a * (math.cos(E) - e)
+    yv = a * math.sqrt(1.0 - e * e) * math.sin(E)
+    v = math.atan2(yv, xv)
+    r = math.hypot(xv, yv)
+
+    cos_N, sin_N = math.cos(N), math.sin(N)
+    cos_vw, sin_vw = math.cos(v + w), math.sin(v + w)
+    cos_i = math.cos(i)
+    x = r * (cos_N * cos_vw - sin_N * sin_vw * cos_i)
+    y = r * (sin_N * cos_vw + cos_N * sin_vw * cos_i)
+    z = r * sin_vw * math.sin(i)
+    return x, y, z
+
+def _sun_longitude(d):
+    """Geometric tropical longitude of the Sun (degrees) and its rectangular position."""
+    x, y, z = _orbit_position("Sun", d)
+    return math.atan2(y, x) * _R2D, x, y
+
+def _perturbations(body, d):
+    """Longitude corrections (degrees) for the mutual Jupiter/Saturn perturbations."""
+    Mj = _element("Jupiter", "M", d) * _D2R
+    Ms = _element("Saturn", "M", d) * _D2R
+    if body == "Jupiter":
+        return (
+            -0.332 * math.sin(2 * Mj - 5 * Ms - 67.6 * _D2R)
+            - 0.056 * math.sin(2 * Mj - 2 * Ms + 21 * _D2R)
+            + 0.042 * math.sin(3 * Mj - 5 * Ms + 21 * _D2R)
+            - 0.036 * math.sin(Mj - 2 * Ms)
+            + 0.022 * math.cos(Mj - Ms)
+            + 0.023 * math.sin(2 * Mj - 3 * Ms + 52 * _D2R)
+            - 0.016 * math.sin(Mj - 5 * Ms - 69 * _D2R)
+        )
+    if body == "Saturn":
+        return (
+            0.812 * math.sin(2 * Mj - 5 * Ms - 67.6 * _D2R)
+            - 0.229 * math.cos(2 * Mj - 4 * Ms - 2 * _D2R)
+            + 0.119 * math.sin(Mj - 2 * Ms - 3 * _D2R)
+            + 0.046 * math.sin(2 * Mj - 6 * Ms - 69 * _D2R)
+            + 0.014 * math.sin(Mj - 3 * Ms + 32 * _D2R)
+        )
+    return 0.0
+
+def fast_tropical_longitudes(jd: float, bodies: list = None):
+    """
+    Low-precision geocentric tropical longitudes.
+
+    Args:
+        jd: Julian Day
+        bodies: names from ELEMENTS, defaults to all of them
+
+    Returns:
+        dict: {PlanetName: Degree (0-360)}
+    """
+    if bodies is None:
+        bodies = list(ELEMENTS.keys())
+
+    d = jd - _ELEMENTS_EPOCH_JD
+    sun_lon, sun_x, sun_y = _sun_longitude(d)
+
+    # Main terms of nutation in longitude, to match the apparent full path
+    moon_node = _element("Moon", "N", d) * _D2R
+    nutation = -0.00478 * math.sin(moon_node) - 0.00037 * math.sin(2 * sun_lon * _D2R)
+
+    results = {}
+    for body in bodies:
+        if body == "Sun":
+            lon = sun_lon
+        elif body == "Moon":
+            # Already apparent (nutation included), so it skips the corrections below
+            results[body] = _MOON.longitude(jd)
+            continue
+        else:
+            # Heliocentric planet plus geocentric Sun gives the geocentric planet
+            x, y, z = _orbit_position(body, d)
+            correction = _perturbations(body, d)
+            if correction:
+                # Perturbations act on the heliocentric longitude
+                helio_lon = math.atan2(y, x) + correction * _D2R
+                r_xy = math.hypot(x, y)
+                x, y = r_xy * math.cos(helio_lon), r_xy * math.sin(helio_lon)
+            lon = math.atan2(y + sun_y, x + sun_x) * _R2D
+        results[body] = (lon + _ABERRATION_DEG + nutation) % 360.0
+    return results
@@ -0,0 +1,290 @@
+"""
+Load test for the UI calculation path: many simulated sessions, no browser.
+
+Each session runs the real main(page) against a StubPage and replays a
+random mix of date picks, ±15m steps, planet filter and orb changes through
+the SettingsSidebar, exactly as clicks would.
+
+Needs a Flet 0.2x release: StubPage uses private control methods that
+Flet 1.0 removed, and the run stops with an error when they are missing.
+
+Example:
+    python loadtest.py --sessions 20 --events 40 --think 0.2
+"""
+import argparse
+import datetime
+import importlib.metadata
+import math
+import random
+import sys
+import threading
+import time
+import tracemalloc
+import flet as ft
+from main import main as app_main
+
+# Relative frequency of the replayed interactions
+EVENT_WEIGHTS = {
+    "step": 5,
+    "date": 2,
+    "filter": 2,
+    "orb": 1,
+}
+
+# Background handlers timed as stages (by function name); others, such as the
+# alert loop and cache warmer, run for the whole session and are not timed
+TIMED_HANDLERS = {"refine": "refine", "fetch": "chart"}
+
+# Private Flet control methods StubPage relies on; the 0.2x releases have them
+FLET_INTERNALS = ("_get_children", "_build_add_commands")
+
+def check_flet_support():
+    """Raises RuntimeError when the installed Flet lacks the internals StubPage uses."""
+    missing = [name for name in FLET_INTERNALS if not hasattr(ft.Control, name)]
+    if missing:
+        try:
+            version = importlib.metadata.version("flet")
+        except importlib.metadata.PackageNotFoundError:
+            version = "unknown"
+        raise RuntimeError(f"Flet {version} has no Control.{', Control.'.join(missing)}; "
+                           f"the load test needs a 0.2x release (tested with flet==0.28.3)")
+
+class LatencyRecorder:
+    """Thread-safe collection of durations per stage."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}
+        self.errors = 0
+        self.messages = []
+
+    def record(self, stage, seconds):
+        with self._lock:
+            self.samples.setdefault(stage, []).append(seconds)
+
+    def error(self, message: str = None):
+        with self._lock:
+            self.errors += 1
+            if message is not None:
+                self.messages.append(message)
+
+def percentile(values, p):
+    """Nearest-rank percentile of an unsorted list."""
+    ordered = sorted(values)
+    k = max(0, math.ceil(p / 100.0 * len(ordered)) - 1)
+    return ordered[k]
+
+class StubPage:
+    """
+    Stands in for ft.Page: holds the same attributes main() sets, attaches
+    itself to every control so control.update() works, and times each
+    update by building the add commands Flet would send for the updated
+    subtree.
+    """
+    def __init__(self, recorder: LatencyRecorder, width: int = 1400, height: int = 900):
+        self.recorder = recorder
+        self.width = width
+        self.height = height
+        # Load tests model the served build
+        self.web = True
+        self.title = None
+        self.vertical_alignment = None
+        self.theme_mode = None
+        self.snack_bar = None
+        self.on_resized = None
+        self.on_close = None
+        self.overlay = []
+        self.controls = []
+        # Threads of timed handlers, joined before the report is made
+        self.timed_threads = []
+        self._lock = threading.Lock()
+
+    def _attach(self, control):
+        stack = [control]
+        while stack:
+            c = stack.pop()
+            c.page = self
+            stack.extend(c._get_children())
+
+    def _render(self, control):
+        self._attach(control)
+        control._build_add_commands()
+
+    def update(self, *controls):
+        t0 = time.perf_counter()
+        # Flet serialises updates per page
+        with self._lock:
+            for control in controls or self.controls:
+                self._render(control)
+        self.recorder.record("update", time.perf_counter() - t0)
+
+    def add(self, *controls):
+        self.controls.extend(controls)
+        self.update(*controls)
+
+    def run_thread(self, handler, *args, **kwargs):
+        stage = TIMED_HANDLERS.get(getattr(handler, "__name__", ""))
+
+        def run():
+            t0 = time.perf_counter()
+            try:
+                handler(*args, **kwargs)
+            except Exception as e:
+                self.recorder.error(f"{getattr(handler, '__name__', 'handler')}: {e!r}")
+                return
+            if stage is not None:
+                self.recorder.record(stage, time.perf_counter() - t0)
+
+        thread = threading.Thread(target=run, daemon=True)
+        if stage is not None:
+            self.timed_threads.append(thread)
+        thread.start()
+
+def _replay_event(sidebar, kind, rng, start_date):
+    """Applies one interaction to the sidebar, as the matching click would."""
+    if kind == "step":
+        sidebar.adjust_time(rng.choice([-15, 15]))
+        return
+    if kind == "date":
+        sidebar.date_picker.value = start_date + datetime.timedelta(days=rng.randrange(-30, 31))
+    elif kind == "filter":
+        sidebar.planet_filter.value = rng.choice(["All"] + sidebar.bodies)
+    elif kind == "orb":
+        sidebar.orb_input.value = str(rng.choice([1.0, 2.0, 3.0, 4.0, 5.0]))
+    sidebar.trigger_change(None)
+
+def run_session(recorder: LatencyRecorder, events: int, think: float, seed: int,
+                start_date: datetime.date, pages: list):
+    """One simulated user; a crash is recorded as an error instead of ending the thread silently."""
+    try:
+        _run_session(recorder, events, think, seed, start_date, pages)
+    except Exception as e:
+        recorder.error(f"session {seed}: {e!r}")
+
+def _run_session(recorder, events, think, seed, start_date, pages):
+    """Opens the app, then replays `events` interactions."""
+    rng = random.Random(seed)
+    page = StubPage(recorder)
+    pages.append(page)
+
+    t0 = time.perf_counter()
+    app_main(page)
+    recorder.record("open", time.perf_counter() - t0)
+
+    layout = page.controls[0]
+    sidebar = layout.settings_sidebar
+
+    # The canvas reports its size once laid out, which starts the chart
+    chart_width = type("ResizeEvent", (), {"width": page.width - 80, "height": 220})
+    layout.separation_chart.on_canvas_resize(chart_width)
+
+    kinds = list(EVENT_WEIGHTS)
+    weights = [EVENT_WEIGHTS[k] for k in kinds]
+    for _ in range(events):
+        if think > 0:
+            time.sleep(rng.expovariate(1.0 / think))
+        kind = rng.choices(kinds, weights)[0]
+        t0 = time.perf_counter()
+        _replay_event(sidebar, kind, rng, start_date)
+        elapsed = time.perf_counter() - t0
+        recorder.record("event", elapsed)
+        recorder.record(f"event:{kind}", elapsed)
+        if sidebar.error_text.value:
+            recorder.error(f"session {seed}: {sidebar.error_text.value}")
+
+def run_load_test(sessions: int = 10, events: int = 30, think: float = 0.2, seed: int = 1,
+                  measure_memory: bool = False):
+    """
+    Runs `sessions` simulated users concurrently.
+
+    Returns:
+        dict: {stages: {stage: {count, p50, p95, p99}} in ms, events, seconds,
+               throughput (events/s), errors, messages, bytes_per_session (or None)}
+    """
+    check_flet_support()
+    recorder = LatencyRecorder()
+    pages = []
+    start_date = datetime.date.today()
+
+    if measure_memory:
+        tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0] if measure_memory else 0
+
+    threads = [
+        threading.Thread(target=run_session, args=(recorder, events, think, seed + n, start_date, pages))
+        for n in range(sessions)
+    ]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # Let the last precise results and charts land before closing the sessions
+    for page in pages:
+        for thread in page.timed_threads:
+            thread.join()
+    elapsed = time.perf_counter() - t0
+
+    bytes_per_session = None
+    if measure_memory:
+        bytes_per_session = (tracemalloc.get_traced_memory()[0] - baseline) / max(sessions, 1)
+        tracemalloc.stop()
+
+    for page in pages:
+        if page.on_close is not None:
+            page.on_close(None)
+
+    stages = {}
+    for stage, values in recorder.samples.items():
+        stages[stage] = {
+            "count": len(values),
+            "p50": percentile(values, 50) * 1000,
+            "p95": percentile(values, 95) * 1000,
+            "p99": percentile(values, 99) * 1000,
+        }
+    total_events = len(recorder.samples.get("event", []))
+    return {
+        "stages": stages,
+        "events": total_events,
+        "seconds": elapsed,
+        "throughput": total_events / elapsed if elapsed > 0 else 0.0,
+        "errors": recorder.errors,
+        "messages": recorder.messages,
+        "bytes_per_session": bytes_per_session,
+    }
+
+def format_report(report: dict, sessions: int):
+    lines = [f"{'stage':<16}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"]
+    for stage in sorted(report["stages"]):
+        s = report["stages"][stage]
+        lines.append(f"{stage:<16}{s['count']:>8}{s['p50']:>10.1f}{s['p95']:>10.1f}{s['p99']:>10.1f}")
+    lines.append(f"{sessions} sessions, {report['events']} events in {report['seconds']:.1f} s "
+                 f"({report['throughput']:.1f} events/s), {report['errors']} errors")
+    if report["bytes_per_session"] is not None:
+        lines.append(f"Memory: {report['bytes_per_session'] / 1024:.0f} KiB per session")
+    for message in report.get("messages", [])[:5]:
+        lines.append(f"Error: {message}")
+    return "\n".join(lines)
+
+def failed(report: dict):
+    """A run fails on any error, or when no interaction was replayed at all."""
+    return report["errors"] > 0 or report["events"] == 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent-session load test of the UI calculation path")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--events", type=int, default=30, help="interactions per session")
+    parser.add_argument("--think", type=float, default=0.2, help="mean seconds between interactions")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--memory", action="store_true", help="trace allocations (slows the run)")
+    args = parser.parse_args(argv)
+
+    try:
+        report = run_load_test(args.sessions, args.events, args.think, args.seed, args.memory)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    print(format_report(report, args.sessions))
+    return 1 if failed(report) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,12 @@
 import flet as ft
 import datetime
-from logic.ephemeris import get_planetary_positions
-from logic.calculator import calculate_aspects, calculate_planet_summary, DEFAULT_ASPECT_RULES
+import threading
+from logic.calculator import calculate_planet_summary, DEFAULT_ASPECT_RULES
+from logic.service import get_calculation_service
+from logic.preview import preview_aspects
+from logic.alerts import AlertScheduler
+from logic.separation import separation_chart_data
+from logic.warmup import CacheWarmer
 from ui.app_layout import AppLayout
 
 def main(page: ft.Page):
@@ -17,31 +22,47 @@ def main(page: ft.Page):
     current_date = None # None means Now
     current_time = None
     current_planet_filter = "All"
+    # Bodies computed and offered in the dropdowns; None means the default PLANETS
+    current_bodies = None
     
-    def update_ui(orb, rules, specific_rules, range_rules, date, time, planet_filter):
-        nonlocal current_orb, current_rules, current_specific_rules, current_range_rules, current_date, current_time, current_planet_filter
-        current_orb = orb
-        current_rules = rules
-        current_specific_rules = specific_rules
-        current_range_rules = range_rules
-        current_date = date
-        current_time = time
-        current_planet_filter = planet_filter
-        
-        # 1. Get Positions
-        # If date is None, use now. If date is set, use that date
-        if current_date:
-            # If time is provided, use it, otherwise default to 12:00
-            t = current_time if current_time else datetime.time(12, 0)
-            calc_date = datetime.datetime.combine(current_date, t)
-        else:
-            calc_date = datetime.datetime.now()
-            
-        positions = get_planetary_positions(calc_date)
-        
-        # 2. Calculate Aspects
-        aspects = calculate_aspects(positions, current_rules, current_orb, current_specific_rules, current_range_rules)
-        
+    # Positions and aspects come from the process-wide service, so sessions
+    # viewing the same instant and rules share one computation
+    calc_session = get_calculation_service().open_session()
+    
+    # Precomputes the instants around the selected one while the user is idle.
+    # Only for the single-user app: a served page shares its workers with every other visitor
+    cache_warmer = None if page.web else CacheWarmer(calc_session)
+    
+    # Upcoming close aspects for the active rules, announced ahead of time.
+    # The windows come from a process-wide feed shared by sessions with the same rules
+    alert_scheduler = AlertScheduler(threshold=1.0)
+    alert_wakeup = threading.Event()
+    session_closed = False
+    
+    def alert_loop():
+        while not session_closed:
+            now = datetime.datetime.now()
+            alert_scheduler.schedule(now)
+            for window in alert_scheduler.pop_due(now):
+                msg = (f"Upcoming: {window['planet1']} {window['aspect_name']} {window['planet2']} "
+                       f"exact at {window['exact'].strftime('%Y-%m-%d %H:%M')}")
+                page.snack_bar = ft.SnackBar(ft.Text(msg))
+                page.snack_bar.open = True
+                page.update()
+            # Sleep until the next alert is due, a rule change, or the hourly horizon check
+            timeout = 3600.0
+            next_time = alert_scheduler.next_fire_time()
+            if next_time is not None:
+                timeout = min(timeout, max((next_time - now).total_seconds(), 0.0))
+            alert_wakeup.wait(timeout)
+            alert_wakeup.clear()
+    
+    # Bumped on every change so a late precise result never replaces a newer view
+    request_counter = 0
+    render_lock = threading.Lock()
+    chart_counter = 0
+    
+    def show_results(positions, aspects, show_alerts):
         # 3. Filter Aspects
         if current_planet_filter and current_planet_filter != "All":
             filtered_aspects = [
@@ -60,6 +81,9 @@ def main(page: ft.Page):
         app_layout.aspects_table.update_data(filtered_aspects)
         
         # 6. Check for Alerts (Simple SnackBar for now)
+        # Only on the precise result, so a preview never raises an alert twice
+        if not show_alerts:
+            return
         # Filter for very close aspects (e.g., < 1 deg)
         close_aspects = [a for a in filtered_aspects if a["orb_diff"] < 1.0]
         if close_aspects:
@@ -67,6 +91,70 @@ def main(page: ft.Page):
             page.snack_bar = ft.SnackBar(ft.Text(msg))
             page.snack_bar.open = True
             page.update()
+    
+    def update_ui(orb, rules, specific_rules, range_rules, date, time, planet_filter):
+        nonlocal current_orb, current_rules, current_specific_rules, current_range_rules, current_date, current_time, current_planet_filter
+        nonlocal request_counter
+        current_orb = orb
+        current_rules = rules
+        current_specific_rules = specific_rules
+        current_range_rules = range_rules
+        current_date = date
+        current_time = time
+        current_planet_filter = planet_filter
+        
+        # 1. Pick the instant
+        # If date is None, use now. If date is set, use that date
+        if current_date:
+            # If time is provided, use it, otherwise default to 12:00
+            t = current_time if current_time else datetime.time(12, 0)
+            calc_date = datetime.datetime.combine(current_date, t)
+        else:
+            calc_date = datetime.datetime.now()
+        
+        # Keep the separation chart on the selected instant
+        app_layout.separation_chart.set_rules(current_rules)
+        app_layout.separation_chart.set_center(calc_date)
+        
+        # Rebuild the alert queue only when the rules themselves changed
+        if alert_scheduler.set_rules(current_rules, current_orb, current_specific_rules, current_range_rules):
+            alert_wakeup.set()
+        
+        with render_lock:
+            request_counter += 1
+            request_id = request_counter
+            
+            # 2. Show the fast preview straight away; refine() settles aspects near an orb edge
+            query_args = (current_rules, current_orb, current_specific_rules, current_range_rules, current_bodies)
+            positions, aspects = preview_aspects(calc_date, *query_args, refine=False)
+            show_results(positions, aspects, show_alerts=False)
+        
+        if cache_warmer:
+            cache_warmer.set_target(calc_date, *query_args)
+        
+        # 2b. Swap in the full-precision result once it is ready
+        def refine():
+            result = calc_session.calculate(calc_date, *query_args)
+            with render_lock:
+                if result is None or request_id != request_counter:
+                    # A newer change arrived while this one was computing
+                    return
+                show_results(result.positions, result.aspects, show_alerts=True)
+        
+        page.run_thread(refine)
+
+    def chart_view_change(start, end, pairs, width):
+        nonlocal chart_counter
+        chart_counter += 1
+        chart_id = chart_counter
+        
+        # Only the visible window, downsampled to the chart width
+        def fetch():
+            series = separation_chart_data(start, end, pairs, width)
+            if chart_id == chart_counter:
+                app_layout.separation_chart.update_data(series)
+        
+        page.run_thread(fetch)
 
     # Initialize Layout
     app_layout = AppLayout(
@@ -74,7 +162,9 @@ def main(page: ft.Page):
         default_orb=current_orb,
         default_rules=current_rules,
         default_specific_rules=current_specific_rules,
-        default_range_rules=current_range_rules
+        default_range_rules=current_range_rules,
+        bodies=current_bodies,
+        on_chart_view_change=chart_view_change
     )
     
     # Handle window resizing
@@ -84,6 +174,18 @@ def main(page: ft.Page):
         
     page.on_resized = page_resize
     
+    # Release this session's results and stop its alerts when the browser tab goes away
+    def page_close(e):
+        nonlocal session_closed
+        session_closed = True
+        alert_wakeup.set()
+        alert_scheduler.close()
+        if cache_warmer:
+            cache_warmer.stop()
+        calc_session.close()
+        
+    page.on_close = page_close
+    
     # Add Pickers to page overlay
     page.overlay.append(app_layout.settings_sidebar.date_picker)
     page.overlay.append(app_layout.settings_sidebar.time_picker)
@@ -95,6 +197,11 @@ def main(page: ft.Page):
     
     # Initial Calculation
     update_ui(current_orb, current_rules, current_specific_rules, current_range_rules, current_date, current_time, current_planet_filter)
+    page.run_thread(alert_loop)
+    
+    # Warm up only after the first paint so it never delays startup
+    if cache_warmer:
+        page.run_thread(cache_warmer.run)
 
 if __name__ == "__main__":
     ft.app(target=main)
@@ -0,0 +1,182 @@
+import argparse
+import math
+import random
+import sys
+import time
+from pymeeus.Epoch import Epoch
+from pymeeus.Moon import Moon, PERIODIC_TERMS_LR_TABLE
+
+# Truncated ELP-2000/82 lunar longitude (Meeus, Astronomical Algorithms ch. 47).
+#
+# The full table has 60 periodic terms plus three additive ones; keeping only
+# the largest terms trades accuracy for speed. Each term's argument is an
+# integer combination of a few polynomials in time, so the combination is
+# folded into one polynomial per term when the engine is built and evaluating
+# a term costs one Horner step and one sine.
+
+_D2R = math.pi / 180.0
+
+# Fundamental arguments as polynomials in Julian centuries from J2000 (degrees)
+_L_PRIME = (218.3164477, 481267.88123421, -0.0015786, 1.0 / 538841.0, -1.0 / 65194000.0)
+_D = (297.8501921, 445267.1114034, -0.0018819, 1.0 / 545868.0, -1.0 / 113065000.0)
+_M = (357.5291092, 35999.0502909, -0.0001536, 1.0 / 24490000.0, 0.0)
+_M_PRIME = (134.9633964, 477198.8675055, 0.0087414, 1.0 / 69699.9, -1.0 / 14712000.0)
+_F = (93.2720950, 483202.0175233, -0.0036539, -1.0 / 3526000.0, 1.0 / 863310000.0)
+_A1 = (119.75, 131.849, 0.0, 0.0, 0.0)
+_A2 = (53.09, 479264.290, 0.0, 0.0, 0.0)
+
+# Additive terms of the longitude: (amplitude in 1e-6 degrees, {argument: multiple})
+_ADDITIVE_TERMS = [
+    (3958.0, {"A1": 1}),
+    (1962.0, {"L_PRIME": 1, "F": -1}),
+    (318.0, {"A2": 1}),
+]
+
+_ARGUMENTS = {"L_PRIME": _L_PRIME, "D": _D, "M": _M, "M_PRIME": _M_PRIME, "F": _F, "A1": _A1, "A2": _A2}
+
+# Largest error of the short nutation series used below (0.5")
+_NUTATION_ERROR_DEG = 0.5 / 3600.0
+
+# Number of periodic terms in the full series
+MAX_TERMS = len(PERIODIC_TERMS_LR_TABLE) + len(_ADDITIVE_TERMS)
+
+def _all_terms():
+    """Every term as (amplitude 1e-6 deg, power of E, {argument: multiple}), largest first."""
+    terms = []
+    for d, m, m_prime, f, amplitude, _ in PERIODIC_TERMS_LR_TABLE:
+        multiples = {"D": d, "M": m, "M_PRIME": m_prime, "F": f}
+        terms.append((amplitude, abs(m), {k: v for k, v in multiples.items() if v}))
+    for amplitude, multiples in _ADDITIVE_TERMS:
+        terms.append((amplitude, 0, multiples))
+    terms.sort(key=lambda term: -abs(term[0]))
+    return terms
+
+def _nutation_deg(t):
+    """Nutation in longitude from its four largest terms (Meeus ch. 22)."""
+    omega = (125.04452 - 1934.136261 * t) * _D2R
+    sun = (280.4665 + 36000.7698 * t) * _D2R
+    moon = (218.3165 + 481267.8813 * t) * _D2R
+    return (-17.20 * math.sin(omega) - 1.32 * math.sin(2 * sun)
+            - 0.23 * math.sin(2 * moon) + 0.21 * math.sin(2 * omega)) / 3600.0
+
+class MoonEngine:
+    """
+    Apparent tropical longitude of the Moon from a truncated ELP series.
+
+    Either `terms` (how many of the largest periodic terms to keep) or
+    `max_error_deg` (keep the fewest terms whose dropped amplitudes add up to
+    no more than this) selects the precision; with neither the full series
+    is used, which agrees with pymeeus to a few 1e-5 degrees.
+    """
+    def __init__(self, terms: int = None, max_error_deg: float = None):
+        all_terms = _all_terms()
+        if terms is None:
+            terms = MAX_TERMS
+            if max_error_deg is not None:
+                budget = max(max_error_deg - _NUTATION_ERROR_DEG, 0.0) * 1e6
+                dropped = 0.0
+                # Drop the smallest terms while their total stays within the budget
+                while terms > 0 and dropped + abs(all_terms[terms - 1][0]) <= budget:
+                    dropped += abs(all_terms[terms - 1][0])
+                    terms -= 1
+        self.terms = max(0, min(terms, MAX_TERMS))
+        self.error_bound_deg = sum(abs(a) for a, _, _ in all_terms[self.terms:]) / 1e6 + _NUTATION_ERROR_DEG
+
+        # Fold each term's multiples into one argument polynomial (radians)
+        self._terms = []
+        for amplitude, e_power, multiples in all_terms[:self.terms]:
+            coefficients = [0.0] * 5
+            for name, multiple in multiples.items():
+                for n, c in enumerate(_ARGUMENTS[name]):
+                    coefficients[n] += multiple * c * _D2R
+            self._terms.append((amplitude / 1e6, e_power, tuple(coefficients)))
+
+    def longitude(self, jd: float):
+        """Apparent tropical longitude (degrees, 0-360) at a Julian Day."""
+        return self.longitudes([jd])[0]
+
+    def longitudes(self, jds: list):
+        """
+        Apparent tropical longitudes for many Julian Days at once.
+
+        Terms are the outer loop so each one is evaluated over all epochs in
+        a single pass.
+
+        Returns:
+            list: Degrees (0-360), one per jd
+        """
+        ts = [(jd - 2451545.0) / 36525.0 for jd in jds]
+        e1 = [1.0 + (-0.002516 - 0.0000074 * t) * t for t in ts]
+        eccentricity = {0: [1.0] * len(ts), 1: e1, 2: [e * e for e in e1]}
+
+        sums = [0.0] * len(ts)
+        for amplitude, e_power, (c0, c1, c2, c3, c4) in self._terms:
+            sums = [
+                s + amplitude * e * math.sin(c0 + t * (c1 + t * (c2 + t * (c3 + t * c4))))
+                for s, e, t in zip(sums, eccentricity[e_power], ts)
+            ]
+
+        lon = _L_PRIME
+        return [
+            (lon[0] + t * (lon[1] + t * (lon[2] + t * (lon[3] + t * lon[4]))) + s + _nutation_deg(t)) % 360.0
+            for s, t in zip(sums, ts)
+        ]
+
+def benchmark(term_counts: list = None, samples: int = 500, seed: int = 1,
+              start_jd: float = 2415020.5, end_jd: float = 2488069.5):
+    """
+    Accuracy and speed of several truncations against pymeeus.
+
+    Returns:
+        list of dicts: [{terms, error_bound, max_error, rms_error, us_per_epoch}],
+        plus a final row for pymeeus itself with terms None
+    """
+    if term_counts is None:
+        term_counts = [5, 10, 15, 20, 30, 40, 50, MAX_TERMS]
+
+    rng = random.Random(seed)
+    jds = [rng.uniform(start_jd, end_jd) for _ in range(samples)]
+
+    t0 = time.perf_counter()
+    reference = [float(Moon.apparent_ecliptical_pos(Epoch(jd))[0]) % 360.0 for jd in jds]
+    reference_seconds = time.perf_counter() - t0
+
+    rows = []
+    for count in term_counts:
+        engine = MoonEngine(terms=count)
+        t0 = time.perf_counter()
+        values = engine.longitudes(jds)
+        elapsed = time.perf_counter() - t0
+        errors = [abs((v - r + 180.0) % 360.0 - 180.0) for v, r in zip(values, reference)]
+        rows.append({
+            "terms": engine.terms,
+            "error_bound": engine.error_bound_deg,
+            "max_error": max(errors),
+            "rms_error": math.sqrt(sum(e * e for e in errors) / len(errors)),
+            "us_per_epoch": elapsed / samples * 1e6,
+        })
+    rows.append({
+        "terms": None, "error_bound": 0.0, "max_error": 0.0, "rms_error": 0.0,
+        "us_per_epoch": reference_seconds / samples * 1e6,
+    })
+    return rows
+
+def format_benchmark(rows: list):
+    lines = [f"{'terms':>8}{'bound (deg)':>14}{'max (deg)':>14}{'rms (deg)':>14}{'us/epoch':>12}"]
+    for row in rows:
+        terms = "pymeeus" if row["terms"] is None else str(row["terms"])
+        lines.append(f"{terms:>8}{row['error_bound']:>14.5f}{row['max_error']:>14.5f}"
+                     f"{row['rms_error']:>14.5f}{row['us_per_epoch']:>12.1f}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Moon engine accuracy/time curve against pymeeus")
+    parser.add_argument("--samples", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--terms", type=int, nargs="+", default=None)
+    args = parser.parse_args(argv)
+    print(format_benchmark(benchmark(args.terms, args.samples, args.seed)))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+import bisect
+import itertools
+from logic.calculator import DEFAULT_ASPECT_RULES
+
+# Multi-body configurations, keyed by name like the aspect rules are keyed by
+# angle. Each edge [i, j, angle] asks for the rule aspect `angle` between the
+# bodies at vertices i and j; vertices are numbered from 0.
+DEFAULT_PATTERNS = {
+    "Stellium": {"edges": [[0, 1, 0], [1, 2, 0], [0, 2, 0]]},
+    "Grand Trine": {"edges": [[0, 1, 120], [1, 2, 120], [0, 2, 120]]},
+    "T-Square": {"edges": [[0, 1, 180], [0, 2, 90], [1, 2, 90]]},
+    "Yod": {"edges": [[0, 1, 60], [0, 2, 150], [1, 2, 150]]},
+    "Grand Cross": {"edges": [[0, 1, 90], [1, 2, 90], [2, 3, 90], [3, 0, 90], [0, 2, 180], [1, 3, 180]]},
+    "Kite": {"edges": [[0, 1, 120], [1, 2, 120], [0, 2, 120], [0, 3, 180], [1, 3, 60], [2, 3, 60]]},
+    "Mystic Rectangle": {"edges": [[0, 1, 60], [1, 2, 120], [2, 3, 60], [3, 0, 120], [0, 2, 180], [1, 3, 180]]},
+}
+
+def _angle_table(rules):
+    """Rule angles sorted, with each one's position in the rule order."""
+    angles = [float(a) for a in rules]
+    order = sorted(range(len(angles)), key=angles.__getitem__)
+    return [angles[k] for k in order], order
+
+def compile_patterns(patterns: dict = None, rules: dict = None):
+    """
+    Prepares pattern definitions for matching.
+
+    Vertices are placed in an order where each one after the first shares an
+    edge with an earlier one, so candidates for it come from ANDing the
+    adjacency masks of its placed neighbours. Symmetries of the pattern are
+    found once here so each match is reported once.
+
+    Raises:
+        ValueError: a pattern uses an angle missing from the rules, repeats
+            a pair or is not connected
+
+    Returns:
+        list: compiled patterns for match_patterns
+    """
+    if patterns is None:
+        patterns = DEFAULT_PATTERNS
+    if rules is None:
+        rules = DEFAULT_ASPECT_RULES
+    angle_index = {float(a): k for k, a in enumerate(rules)}
+
+    compiled = []
+    for name, definition in patterns.items():
+        labels = {}
+        for i, j, angle in definition["edges"]:
+            i, j = int(i), int(j)
+            k = angle_index.get(float(angle))
+            if k is None:
+                raise ValueError(f"Pattern {name} uses angle {angle}, which is not in the rules")
+            pair = frozenset((i, j))
+            if i == j or pair in labels:
+                raise ValueError(f"Pattern {name} has an invalid or repeated edge {i}-{j}")
+            labels[pair] = k
+        size = max(max(pair) for pair in labels) + 1
+
+        order = [0]
+        while len(order) < size:
+            # Most constrained vertex next: the one with most edges to placed vertices
+            links, v = max((sum(frozenset((v, u)) in labels for u in order), v)
+                           for v in range(size) if v not in order)
+            if links == 0:
+                raise ValueError(f"Pattern {name} is not connected")
+            order.append(v)
+
+        position = {v: p for p, v in enumerate(order)}
+        edges = {frozenset(position[v] for v in pair): k for pair, k in labels.items()}
+        constraints = [[] for _ in order]
+        for pair, k in edges.items():
+            a, b = sorted(pair)
+            constraints[b].append((a, k))
+        first_angles = sorted({k for pair, k in edges.items() if 0 in pair})
+
+        # Relabellings of the vertices that keep every edge, identity excluded
+        symmetries = [
+            perm for perm in itertools.permutations(range(size))
+            if perm != tuple(range(size))
+            and all(edges.get(frozenset(perm[p] for p in pair)) == k for pair, k in edges.items())
+        ]
+        compiled.append((name, order, first_angles, constraints, symmetries))
+    return compiled
+
+def _aspect_edges(lons, angles, order, orb):
+    """(i, j, rule index) for every pair in aspect, first matching rule winning as in calculate_aspects."""
+    edges = []
+    n = len(lons)
+    for i in range(n):
+        deg1 = lons[i]
+        for j in range(i + 1, n):
+            diff = abs(deg1 - lons[j])
+            if diff > 180:
+                diff = 360 - diff
+            lo = bisect.bisect_left(angles, diff - orb)
+            hi = bisect.bisect_right(angles, diff + orb, lo)
+            if lo < hi:
+                edges.append((i, j, min(order[lo:hi])))
+    return edges
+
+def adjacency_masks(edges, body_count: int, angle_count: int):
+    """
+    Per-angle adjacency bitmasks of one instant's aspect graph.
+
+    Returns:
+        list: masks[angle index][body] has bit b set when body b is in that aspect with the body
+    """
+    masks = [[0] * body_count for _ in range(angle_count)]
+    for i, j, k in edges:
+        row = masks[k]
+        row[i] |= 1 << j
+        row[j] |= 1 << i
+    return masks
+
+def aspect_masks(aspects: list, bodies: list, rules: dict = None):
+    """Adjacency masks from an existing calculate_aspects result."""
+    if rules is None:
+        rules = DEFAULT_ASPECT_RULES
+    body_index = {b: k for k, b in enumerate(bodies)}
+    # The first rule of a name wins, as calculate_aspects stops at the first match
+    name_index = {}
+    for k, info in enumerate(rules.values()):
+        name_index.setdefault(info["name"], k)
+    edges = [(body_index[a["planet1"]], body_index[a["planet2"]], name_index[a["aspect_name"]]) for a in aspects]
+    return adjacency_masks(edges, len(bodies), len(rules))
+
+def match_patterns(masks: list, compiled: list, bodies: list):
+    """
+    Every occurrence of each compiled pattern in one instant's masks.
+
+    Returns:
+        list of dicts: [{pattern, bodies}], bodies listed in the pattern's vertex order
+    """
+    n = len(bodies)
+    full = (1 << n) - 1
+    present = [0] * len(masks)
+    for k, row in enumerate(masks):
+        for b, m in enumerate(row):
+            if m:
+                present[k] |= 1 << b
+
+    found = []
+    for name, order, first_angles, constraints, symmetries in compiled:
+        size = len(order)
+        start = full
+        for k in first_angles:
+            start &= present[k]
+
+        def extend(assigned, candidates, used):
+            # Try each candidate body for the next vertex, lowest bit first
+            while candidates:
+                low = candidates & -candidates
+                candidates ^= low
+                match = assigned + (low.bit_length() - 1,)
+                p = len(match)
+                if p < size:
+                    nxt = full & ~(used | low)
+                    for q, k in constraints[p]:
+                        nxt &= masks[k][match[q]]
+                    extend(match, nxt, used | low)
+                # Report only the smallest labelling among the pattern's symmetries
+                elif all(match <= tuple(match[perm.index(q)] for q in range(size)) for perm in symmetries):
+                    names = [None] * size
+                    for q, v in enumerate(order):
+                        names[v] = bodies[match[q]]
+                    found.append({"pattern": name, "bodies": names})
+
+        extend((), start, 0)
+    return found
+
+def find_patterns(positions: dict, patterns: dict = None, rules: dict = None, orb: float = 3.0):
+    """
+    Patterns present at one instant.
+
+    Args:
+        positions: dict {Planet: Degree}
+
+    Returns:
+        list of dicts: [{pattern, bodies}]
+    """
+    return pattern_series({b: [deg] for b, deg in positions.items()}, patterns, rules, orb)[0]
+
+def pattern_series(columns: dict, patterns: dict = None, rules: dict = None, orb: float = 3.0):
+    """
+    Patterns at every instant of a position series.
+
+    The aspect graph changes rarely between neighbouring instants, so
+    matches are memoised by the graph's edge list and only new graphs are
+    searched. Instants with the same graph share one result list.
+
+    Args:
+        columns: {Planet: [Degree per instant]}, as from get_position_series
+
+    Returns:
+        list: one match_patterns result per instant
+    """
+    if rules is None:
+        rules = DEFAULT_ASPECT_RULES
+    compiled = compile_patterns(patterns, rules)
+    angles, order = _angle_table(rules)
+    bodies = list(columns)
+
+    memo = {}
+    results = []
+    for lons in zip(*columns.values()):
+        key = tuple(_aspect_edges(lons, angles, order, orb))
+        found = memo.get(key)
+        if found is None:
+            found = memo[key] = match_patterns(adjacency_masks(key, len(bodies), len(rules)), compiled, bodies)
+        results.append(found)
+    return results
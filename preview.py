@@ -0,0 +1,85 @@
+import bisect
+import datetime
+from logic.ephemeris import get_planetary_positions, get_julian_day, get_sidereal_longitude, PRECISION_FAST
+from logic.fast_ephemeris import FAST_ERROR_DEG
+from logic.calculator import calculate_aspects, DEFAULT_ASPECT_RULES
+
+def classification_edges(rules, orb, range_rules):
+    """Separations (0-180) at which calculate_aspects can change its answer."""
+    edges = set()
+    for angle in rules.keys():
+        edges.add(float(angle) - orb)
+        edges.add(float(angle) + orb)
+    for r_rule in range_rules:
+        edges.add(r_rule.get("min"))
+        edges.add(r_rule.get("max"))
+    return sorted(e for e in edges if e is not None)
+
+def uncertain_bodies(positions: dict, rules: dict = None, orb: float = 3.0, range_rules: list = None,
+                     errors: dict = None):
+    """
+    Bodies in at least one pair whose separation lies within the pair's
+    summed position errors of an orb or range-rule edge, i.e. whose aspect
+    could flip with exact positions.
+
+    Args:
+        errors: {Planet: error bound in degrees}, FAST_ERROR_DEG by default;
+                bodies missing from it are taken as exact
+
+    Returns:
+        set: planet names
+    """
+    if rules is None:
+        rules = DEFAULT_ASPECT_RULES
+    if range_rules is None:
+        range_rules = []
+    if errors is None:
+        errors = FAST_ERROR_DEG
+
+    edges = classification_edges(rules, orb, range_rules)
+    names = list(positions.keys())
+    uncertain = set()
+    for i in range(len(names)):
+        for j in range(i + 1, len(names)):
+            p1 = names[i]
+            p2 = names[j]
+            margin = errors.get(p1, 0.0) + errors.get(p2, 0.0)
+            if margin == 0.0:
+                continue
+            diff = abs(positions[p1] - positions[p2])
+            if diff > 180:
+                diff = 360 - diff
+            # Nearest edge on either side of the separation
+            k = bisect.bisect_left(edges, diff)
+            near = [edges[n] for n in (k - 1, k) if 0 <= n < len(edges)]
+            if any(abs(diff - edge) <= margin for edge in near):
+                uncertain.add(p1)
+                uncertain.add(p2)
+    return uncertain
+
+def preview_aspects(dt: datetime.datetime, rules: dict = None, orb: float = 3.0,
+                    specific_rules: list = None, range_rules: list = None, bodies: list = None,
+                    refine: bool = True):
+    """
+    Fast positions and aspects for interactive use.
+
+    Positions come from the fast ephemeris. With `refine`, bodies involved in
+    a pair close to an orb edge are recomputed at full precision before
+    aspects are matched, so the set of aspects equals the full-precision
+    one. Without it the raw fast result comes back at once, for callers
+    that follow up with the full-precision result anyway.
+
+    Returns:
+        tuple: (positions dict, aspects list)
+    """
+    positions = get_planetary_positions(dt, precision=PRECISION_FAST, bodies=bodies)
+
+    if refine:
+        uncertain = uncertain_bodies(positions, rules, orb, range_rules)
+        if uncertain:
+            jd = get_julian_day(dt)
+            for body in uncertain:
+                positions[body] = get_sidereal_longitude(body, jd)
+
+    aspects = calculate_aspects(positions, rules, orb, specific_rules, range_rules)
+    return positions, aspects
@@ -0,0 +1,104 @@
+import datetime
+from logic.ephemeris import get_planetary_positions, PRECISION_FULL
+
+# Positions are sampled at this step and interpolated in between. The fastest
+# pair (Moon with anything) needs about 3 hours to cross a 1° band, so an
+# hourly step cannot skip one for widths down to about 0.5°.
+SAMPLE_STEP = datetime.timedelta(hours=1)
+
+# Edges and exact times are refined on the interpolated positions to this precision
+EDGE_TOLERANCE = datetime.timedelta(seconds=30)
+
+def unwrap(series):
+    """Removes the 360° jumps from a list of longitudes."""
+    out = [series[0]]
+    for deg in series[1:]:
+        out.append(out[-1] + (deg - out[-1] + 180.0) % 360.0 - 180.0)
+    return out
+
+# Samples between the ends of a range fall on whole multiples of the step
+# from this instant (whole hours), so searches over overlapping ranges, from
+# any session, evaluate and cache the same instants
+_GRID_ANCHOR = datetime.datetime(2000, 1, 1)
+
+def floor_time(dt: datetime.datetime, step: datetime.timedelta = SAMPLE_STEP):
+    """Latest grid instant at or before dt."""
+    anchor = _GRID_ANCHOR.replace(tzinfo=dt.tzinfo)
+    return anchor + step * ((dt - anchor) // step)
+
+def ceil_time(dt: datetime.datetime, step: datetime.timedelta = SAMPLE_STEP):
+    """Earliest grid instant at or after dt."""
+    t = floor_time(dt, step)
+    return t if t == dt else t + step
+
+def sample_times(start: datetime.datetime, end: datetime.datetime, step: datetime.timedelta = SAMPLE_STEP):
+    """Sample instants: start, every grid instant strictly between, and end."""
+    times = []
+    if start < end:
+        times.append(start)
+        t = floor_time(start, step) + step
+        while t < end:
+            times.append(t)
+            t += step
+    times.append(end)
+    return times
+
+class SampledTracks:
+    """
+    Longitudes of every body sampled over [start, end] and linearly
+    interpolated in between.
+
+    Positions along the range are addressed by a fractional sample index x:
+    x = 2.5 is halfway between the third and fourth samples.
+    """
+    def __init__(self, start: datetime.datetime, end: datetime.datetime, precision: str = PRECISION_FULL):
+        self.times = sample_times(start, end)
+        self.samples = [get_planetary_positions(t, precision=precision) for t in self.times]
+        self.names = list(self.samples[0].keys())
+        self.tracks = {name: unwrap([s[name] for s in self.samples]) for name in self.names}
+        self.last = len(self.times) - 1
+
+    def split(self, x: float):
+        """Sample index and fraction for a fractional sample position x."""
+        k = min(int(x), self.last - 1)
+        return k, x - k
+
+    def lon_at(self, name: str, x: float):
+        """Unwrapped longitude of a body at position x."""
+        k, frac = self.split(x)
+        track = self.tracks[name]
+        return track[k] + (track[k + 1] - track[k]) * frac
+
+    def positions_at(self, names, x: float):
+        """{name: Degree (0-360)} at position x."""
+        return {name: self.lon_at(name, x) % 360.0 for name in names}
+
+    def time_at(self, x: float):
+        k, frac = self.split(x)
+        return self.times[k] + (self.times[k + 1] - self.times[k]) * frac
+
+    def edge(self, inside, x_out: int, x_in: int):
+        """
+        Bisects between neighbouring samples x_out (outside) and x_in (inside)
+        for where the predicate `inside(x)` turns, to EDGE_TOLERANCE.
+        """
+        span = abs(self.times[x_in] - self.times[x_out])
+        lo, hi = float(x_out), float(x_in)
+        while abs(hi - lo) * span > EDGE_TOLERANCE:
+            mid = 0.5 * (lo + hi)
+            if inside(mid):
+                hi = mid
+            else:
+                lo = mid
+        return 0.5 * (lo + hi)
+
+    def closest(self, distance, lo: float, hi: float):
+        """Ternary search for the position in [lo, hi] where `distance(x)` is smallest."""
+        while (hi - lo) * SAMPLE_STEP > EDGE_TOLERANCE:
+            m1 = lo + (hi - lo) / 3.0
+            m2 = hi - (hi - lo) / 3.0
+            if distance(m1) < distance(m2):
+                hi = m2
+            else:
+                lo = m1
+        return 0.5 * (lo + hi)
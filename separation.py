@@ -0,0 +1,113 @@
+import datetime
+from logic.ephemeris import get_position_series, PRECISION_FAST
+
+# Positions computed per output pixel before downsampling, so narrow features
+# (a Moon conjunction is a sharp V) survive the reduction
+OVERSAMPLE = 4
+
+# Upper bound on positions computed for one chart request
+MAX_SAMPLES = 4000
+
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+
+def separation(lon1: float, lon2: float):
+    """Shortest angular distance between two longitudes (0-180)."""
+    diff = abs(lon1 - lon2) % 360.0
+    return 360.0 - diff if diff > 180 else diff
+
+def lttb(values: list, threshold: int):
+    """
+    Largest-Triangle-Three-Buckets downsampling of an evenly spaced series.
+
+    Args:
+        values: y values, x being their index
+        threshold: number of points to keep (at least 3)
+
+    Returns:
+        list: indices of the kept points, first and last included
+    """
+    n = len(values)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    kept = [0]
+    bucket = (n - 2) / (threshold - 2)
+    a = 0
+    for b in range(threshold - 2):
+        lo = int(b * bucket) + 1
+        hi = int((b + 1) * bucket) + 1
+
+        # Average of the next bucket is the third corner of the triangle
+        next_lo = hi
+        next_hi = min(int((b + 2) * bucket) + 1, n)
+        avg_x = (next_lo + next_hi - 1) / 2.0
+        avg_y = sum(values[next_lo:next_hi]) / (next_hi - next_lo)
+
+        best, best_area = lo, -1.0
+        ax, ay = a, values[a]
+        for k in range(lo, hi):
+            area = abs((ax - avg_x) * (values[k] - ay) - (ax - k) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = k, area
+        kept.append(best)
+        a = best
+    kept.append(n - 1)
+    return kept
+
+def minmax(values: list, buckets: int):
+    """
+    Keeps the lowest and highest point of each of `buckets` equal slices.
+
+    Returns:
+        list: indices of the kept points in order
+    """
+    n = len(values)
+    if 2 * buckets >= n:
+        return list(range(n))
+
+    kept = []
+    for b in range(buckets):
+        lo = b * n // buckets
+        hi = (b + 1) * n // buckets
+        low = min(range(lo, hi), key=values.__getitem__)
+        high = max(range(lo, hi), key=values.__getitem__)
+        kept.extend(sorted({low, high}))
+    return kept
+
+def separation_chart_data(start: datetime.datetime, end: datetime.datetime, pairs: list, width: int,
+                          method: str = "lttb", precision: str = PRECISION_FAST):
+    """
+    Separation curves for a chart `width` pixels wide.
+
+    Positions are computed in one batch for every body involved, then each
+    curve is downsampled to about one point per pixel.
+
+    Args:
+        pairs: [(planet1, planet2)]
+        width: drawable width of the chart in pixels
+        method: "lttb" or "minmax"
+
+    Returns:
+        dict: {(planet1, planet2): [(datetime, separation)]}
+    """
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    if not pairs:
+        return {}
+
+    width = max(int(width), 3)
+    count = min(width * OVERSAMPLE, MAX_SAMPLES)
+    times = [start + (end - start) * k / (count - 1) for k in range(count)]
+
+    bodies = list(dict.fromkeys(body for pair in pairs for body in pair))
+    columns = get_position_series(times, precision=precision, bodies=bodies)
+
+    series = {}
+    for p1, p2 in pairs:
+        values = [separation(a, b) for a, b in zip(columns[p1], columns[p2])]
+        if method == "lttb":
+            kept = lttb(values, width)
+        else:
+            kept = minmax(values, width // 2)
+        series[(p1, p2)] = [(times[k], values[k]) for k in kept]
+    return series
@@ -0,0 +1,314 @@
+import collections
+import copy
+import datetime
+import sys
+import threading
+import types
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from logic.ephemeris import get_planetary_positions, PLANETS
+from logic.calculator import calculate_aspects
+from logic.cache import time_key, key_to_datetime, rules_fingerprint
+
+# Shared, read-only result of one (instant, rule set) query.
+# positions is a read-only mapping, aspects a tuple of read-only mappings.
+CalculationResult = collections.namedtuple("CalculationResult", ["positions", "aspects"])
+
+# Default number of finished results kept for all sessions together
+DEFAULT_MAX_RESULTS = 512
+
+# Default memory budget of the results a single session keeps for itself
+DEFAULT_SESSION_MAX_BYTES = 256 * 1024
+
+# Default memory budget of the results a session computes ahead of use
+DEFAULT_WARM_MAX_BYTES = 2 * 1024 * 1024
+
+def _query_key(dt, rules, orb, specific_rules, range_rules, bodies):
+    """(time key, rule fingerprint, body tuple) identifying one query."""
+    bodies = tuple(bodies) if bodies is not None else tuple(PLANETS)
+    return time_key(dt), rules_fingerprint(rules, orb, specific_rules, range_rules), bodies
+
+def _freeze(positions, aspects):
+    return CalculationResult(
+        types.MappingProxyType(dict(positions)),
+        tuple(types.MappingProxyType(dict(a)) for a in aspects)
+    )
+
+def _deep_sizeof(obj, seen=None):
+    """Approximate memory held by obj and everything it references."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, types.MappingProxyType):
+        obj = dict(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_sizeof(k, seen) + _deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_sizeof(item, seen) for item in obj)
+    return size
+
+class CalculationService:
+    """
+    Process-wide calculation tier shared by all UI sessions.
+
+    Identical queries share one computation: a query already in flight is
+    joined instead of restarted (single-flight) and finished results are kept
+    in an LRU. The heavy work runs in a bounded worker pool, so CPU grows with
+    the number of distinct queries rather than with connected sessions.
+
+    Speculative warm-up work runs in its own small pool, so it never queues
+    ahead of a request someone is waiting for. Its results are shared too,
+    but kept at the cold end of the LRU.
+    """
+    def __init__(self, max_workers: int = 4, max_results: int = DEFAULT_MAX_RESULTS, cache=None,
+                 warm_workers: int = 1):
+        """
+        Args:
+            max_workers: size of the worker pool
+            max_results: finished results kept in memory
+            cache: optional ResultCache used to load and store results on disk
+            warm_workers: size of the warm-up pool
+        """
+        self.max_results = max_results
+        self.cache = cache
+        self.computed = 0
+        self.shared = 0
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="calc")
+        self._warm_executor = ThreadPoolExecutor(max_workers=warm_workers, thread_name_prefix="warm")
+        # Re-entrant: a done callback may run in the submitting thread
+        self._lock = threading.RLock()
+        self._in_flight = {}
+        self._speculative = set()
+        self._results = collections.OrderedDict()
+        self._sessions = set()
+
+    def _compute(self, key, rules, orb, specific_rules, range_rules):
+        dt = key_to_datetime(key[0])
+        bodies = key[2]
+        # The disk cache holds the default body set only
+        if self.cache is not None and bodies == tuple(PLANETS):
+            positions, aspects = self.cache.calculate_aspects(dt, rules, orb, specific_rules, range_rules)
+        else:
+            positions = get_planetary_positions(dt, bodies=list(bodies))
+            aspects = calculate_aspects(positions, rules, orb, specific_rules, range_rules)
+        return _freeze(positions, aspects)
+
+    def _finish(self, key, future):
+        with self._lock:
+            self._in_flight.pop(key, None)
+            speculative = key in self._speculative
+            self._speculative.discard(key)
+            if future.cancelled() or future.exception() is not None:
+                return
+            self._results[key] = future.result()
+            if speculative:
+                # Nobody asked for it yet, so it is the first to make room
+                self._results.move_to_end(key, last=False)
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+
+    def submit(self, dt: datetime.datetime, rules: dict = None, orb: float = 3.0,
+               specific_rules: list = None, range_rules: list = None, bodies: list = None, warm: bool = False):
+        """
+        Starts (or joins) the calculation for an instant and rule set.
+
+        Args:
+            dt: datetime (timezone aware or naive, if naive assumed UTC)
+            rules, orb, specific_rules, range_rules: as for calculate_aspects
+            bodies: as for get_planetary_positions, defaults to PLANETS
+            warm: speculative work for the warm-up pool; an interactive
+                  request for the same query takes it over if it has not started
+
+        Returns:
+            Future: resolves to a CalculationResult
+        """
+        key = _query_key(dt, rules, orb, specific_rules, range_rules, bodies)
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+                self.shared += 1
+                future = Future()
+                future.set_result(result)
+                return future
+
+            future = self._in_flight.get(key)
+            if future is not None:
+                if warm or key not in self._speculative or not future.cancel():
+                    if not warm:
+                        # Someone needs it now, so it is no longer speculative
+                        self._speculative.discard(key)
+                    self.shared += 1
+                    return future
+                # Still queued behind other warm-up work: run it in the main pool instead
+                self.computed -= 1
+
+            # Copy the rules so later edits by the session cannot change the query
+            args = copy.deepcopy((rules, orb, specific_rules, range_rules))
+            executor = self._warm_executor if warm else self._executor
+            future = executor.submit(self._compute, key, *args)
+            self._in_flight[key] = future
+            self.computed += 1
+            if warm:
+                self._speculative.add(key)
+            future.add_done_callback(lambda f: self._finish(key, f))
+            return future
+
+    def calculate(self, dt: datetime.datetime, rules: dict = None, orb: float = 3.0,
+                  specific_rules: list = None, range_rules: list = None, bodies: list = None):
+        """Blocking form of submit; returns a CalculationResult."""
+        return self.submit(dt, rules, orb, specific_rules, range_rules, bodies).result()
+
+    def open_session(self, max_bytes: int = DEFAULT_SESSION_MAX_BYTES, warm_max_bytes: int = DEFAULT_WARM_MAX_BYTES):
+        """Registers a UI session; close it when the page goes away."""
+        session = CalculationSession(self, max_bytes, warm_max_bytes)
+        with self._lock:
+            self._sessions.add(session)
+        return session
+
+    def _close_session(self, session):
+        with self._lock:
+            self._sessions.discard(session)
+
+    def stats(self):
+        """
+        Returns:
+            dict: {computed, shared, in_flight, results, sessions, session_bytes}
+        """
+        with self._lock:
+            sessions = list(self._sessions)
+            stats = {
+                "computed": self.computed,
+                "shared": self.shared,
+                "in_flight": len(self._in_flight),
+                "results": len(self._results),
+                "sessions": len(sessions),
+            }
+        stats["session_bytes"] = sum(s.memory_bytes() for s in sessions)
+        return stats
+
+    def shutdown(self):
+        """Stops the worker pools after running work finishes."""
+        self._warm_executor.shutdown(wait=True, cancel_futures=True)
+        self._executor.shutdown(wait=True)
+
+class CalculationSession:
+    """
+    One UI session's view of the shared service.
+
+    Keeps the session's recently used results for quick back-and-forth
+    navigation, within a measured memory budget. Only the latest request
+    counts: a result arriving after a newer request was made is dropped.
+    
+    Results prefetched for likely next requests are held apart, under their
+    own budget, until a request uses them.
+    """
+    def __init__(self, service, max_bytes: int = DEFAULT_SESSION_MAX_BYTES,
+                 warm_max_bytes: int = DEFAULT_WARM_MAX_BYTES):
+        self.service = service
+        self.max_bytes = max_bytes
+        self.warm_max_bytes = warm_max_bytes
+        self.warm_hits = 0
+        self._lock = threading.Lock()
+        self._recent = collections.OrderedDict()
+        self._sizes = {}
+        self._warm = collections.OrderedDict()
+        self._warm_sizes = {}
+        self._generation = 0
+
+    def calculate(self, dt: datetime.datetime, rules: dict = None, orb: float = 3.0,
+                  specific_rules: list = None, range_rules: list = None, bodies: list = None):
+        """
+        Calculates through the shared service.
+
+        Returns:
+            CalculationResult, or None when a newer request superseded this one
+        """
+        key = _query_key(dt, rules, orb, specific_rules, range_rules, bodies)
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            result = self._recent.get(key)
+            if result is None and key in self._warm:
+                result = self._warm.pop(key)
+                del self._warm_sizes[key]
+                self.warm_hits += 1
+        if result is None:
+            result = self.service.calculate(dt, rules, orb, specific_rules, range_rules, bodies)
+
+        with self._lock:
+            if generation != self._generation:
+                return None
+            self._remember(key, result)
+        return result
+
+    def _remember(self, key, result):
+        # Caller holds the lock
+        if key in self._recent:
+            self._recent.move_to_end(key)
+            return
+        self._recent[key] = result
+        self._sizes[key] = _deep_sizeof(result)
+        # Always keep the latest result, even if it alone exceeds the budget
+        while len(self._recent) > 1 and sum(self._sizes.values()) > self.max_bytes:
+            old_key, _ = self._recent.popitem(last=False)
+            del self._sizes[old_key]
+
+    def prefetch(self, dt: datetime.datetime, rules: dict = None, orb: float = 3.0,
+                 specific_rules: list = None, range_rules: list = None, bodies: list = None):
+        """
+        Computes a result ahead of use, in the service's warm-up pool,
+        without superseding the session's requests. The oldest prefetched
+        results make room for new ones.
+
+        Returns:
+            int: measured size of the stored result, 0 if it was already held
+        """
+        key = _query_key(dt, rules, orb, specific_rules, range_rules, bodies)
+        with self._lock:
+            if key in self._recent or key in self._warm:
+                return 0
+        try:
+            result = self.service.submit(dt, rules, orb, specific_rules, range_rules, bodies, warm=True).result()
+        except CancelledError:
+            # An interactive request took the computation over; wait for that one
+            result = self.service.submit(dt, rules, orb, specific_rules, range_rules, bodies, warm=True).result()
+
+        size = _deep_sizeof(result)
+        with self._lock:
+            if key in self._recent or key in self._warm:
+                return 0
+            self._warm[key] = result
+            self._warm_sizes[key] = size
+            while len(self._warm) > 1 and sum(self._warm_sizes.values()) > self.warm_max_bytes:
+                old_key, _ = self._warm.popitem(last=False)
+                del self._warm_sizes[old_key]
+        return size
+
+    def memory_bytes(self):
+        """Measured size of the results this session keeps, prefetched ones included."""
+        with self._lock:
+            return sum(self._sizes.values()) + sum(self._warm_sizes.values())
+
+    def close(self):
+        """Releases the session's results and unregisters it."""
+        with self._lock:
+            self._recent.clear()
+            self._sizes.clear()
+            self._warm.clear()
+            self._warm_sizes.clear()
+        self.service._close_session(self)
+
+_service = None
+_service_lock = threading.Lock()
+
+def get_calculation_service():
+    """Returns the process-wide CalculationService, creating it on first use."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = CalculationService()
+        return _service
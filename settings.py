@@ -2,15 +2,23 @@ import flet as ft
 import json
 import datetime
 from logic.calculator import DEFAULT_ASPECT_RULES
+from logic.ephemeris import PLANETS
+
+# Bodies offered in the planet dropdowns unless the caller passes its own set:
+# the ones get_planetary_positions computes by default
+DEFAULT_BODIES = list(PLANETS)
 
 class SettingsSidebar(ft.Column):
-    def __init__(self, on_change_callback, default_orb=3.0, default_rules=None, default_specific_rules=None, default_range_rules=None):
+    def __init__(self, on_change_callback, default_orb=3.0, default_rules=None, default_specific_rules=None, default_range_rules=None,
+                 bodies=None):
         super().__init__()
         self.on_change_callback = on_change_callback
         self.width = 300
         self.spacing = 20
         self.scroll = ft.ScrollMode.AUTO
         
+        self.bodies = list(bodies) if bodies else DEFAULT_BODIES
+        
         # Initialize specific rules list
         self.specific_rules_list = default_specific_rules if default_specific_rules else []
         
@@ -42,18 +50,7 @@ class SettingsSidebar(ft.Column):
         # Planet Filter (Moved to Top)
         self.planet_filter = ft.Dropdown(
             label="Filter by Planet",
-            options=[
-                ft.dropdown.Option("All"),
-                ft.dropdown.Option("Sun"),
-                ft.dropdown.Option("Moon"),
-                ft.dropdown.Option("Mars"),
-                ft.dropdown.Option("Mercury"),
-                ft.dropdown.Option("Jupiter"),
-                ft.dropdown.Option("Venus"),
-                ft.dropdown.Option("Saturn"),
-                ft.dropdown.Option("Rahu"),
-                ft.dropdown.Option("Ketu")
-            ],
+            options=[ft.dropdown.Option("All")] + [ft.dropdown.Option(p) for p in self.bodies],
             value="All",
             on_change=self.trigger_change
         )
@@ -81,13 +78,13 @@ class SettingsSidebar(ft.Column):
         # --- Specific Rule Builder ---
         self.p1_dropdown = ft.Dropdown(
             label="Planet 1",
-            options=[ft.dropdown.Option(p) for p in ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu"]],
+            options=[ft.dropdown.Option(p) for p in self.bodies],
             width=130,
             text_size=12
         )
         self.p2_dropdown = ft.Dropdown(
             label="Planet 2",
-            options=[ft.dropdown.Option(p) for p in ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu"]],
+            options=[ft.dropdown.Option(p) for p in self.bodies],
             width=130,
             text_size=12
         )
@@ -0,0 +1,30 @@
+import datetime
+import os
+import tempfile
+from logic.accuracy import generate_golden, load_golden, compare_engine, check_report, ENGINES, ENGINE_PRECISION
+
+def test_accuracy():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "golden.json")
+        generate_golden(path, count=20, seed=7,
+                        start=datetime.datetime(2000, 1, 1), end=datetime.datetime(2030, 1, 1), hit_windows=2)
+        dataset = load_golden(path)
+
+    # The reference engine reproduces its own dataset exactly
+    full = compare_engine(dataset, ENGINES["full"], ENGINE_PRECISION["full"])
+    assert full["hits"] > 0
+    assert check_report(full, max_error=0.0, max_mismatches=0, max_hit_minutes=0.0)
+
+    # The fast engine stays within its documented error, only misclassifies
+    # pairs sitting on an orb edge (about one instant in 25) and finds every
+    # exact hit within two hours, the slowest pairs being the furthest off.
+    # The preview refinement removes every classification mismatch
+    fast = compare_engine(dataset, ENGINES["fast"], ENGINE_PRECISION["fast"])
+    assert fast["mismatches"] == fast["boundary_mismatches"]
+    assert check_report(fast, max_error=0.1, max_mismatches=len(dataset["samples"]) // 4, max_hit_minutes=120.0)
+    preview = compare_engine(dataset, ENGINES["preview"])
+    assert check_report(preview, max_error=0.1, max_mismatches=0)
+    print("SUCCESS: Accuracy harness verification passed!")
+
+if __name__ == "__main__":
+    test_accuracy()
@@ -0,0 +1,58 @@
+import datetime
+from logic.alerts import AlertScheduler, AlertService, find_alert_windows
+from logic.sampling import sample_times
+from logic.ephemeris import get_planetary_positions
+from logic.calculator import DEFAULT_ASPECT_RULES
+
+def _within(window, dt):
+    p = get_planetary_positions(dt)
+    diff = abs(p[window["planet1"]] - p[window["planet2"]])
+    if diff > 180:
+        diff = 360 - diff
+    return abs(diff - window["angle"]) < 1.0
+
+def test_alerts():
+    start = datetime.datetime(2024, 5, 1)
+    end = start + datetime.timedelta(days=1)
+    windows = find_alert_windows(start, end, DEFAULT_ASPECT_RULES, 3.0, threshold=1.0)
+    assert windows
+
+    # Window edges are accurate to well within two minutes
+    margin = datetime.timedelta(minutes=2)
+    for w in windows:
+        assert _within(w, w["exact"])
+        if not w["open_start"]:
+            assert not _within(w, w["start"] - margin) and _within(w, w["start"] + margin)
+
+    # Samples between the ends sit on whole hours, whatever the range
+    times = sample_times(start + datetime.timedelta(minutes=7), end)
+    assert times[0].minute == 7 and all(t.minute == 0 and t.second == 0 for t in times[1:])
+
+    service = AlertService()
+    scheduler = AlertScheduler(threshold=1.0, horizon=datetime.timedelta(days=1), lead=datetime.timedelta(0),
+                               service=service)
+    assert scheduler.set_rules(DEFAULT_ASPECT_RULES, 3.0, [], [])
+    assert not scheduler.set_rules(DEFAULT_ASPECT_RULES, 3.0, [], [])
+    scheduler.schedule(start)
+
+    # Only windows starting after the queue was built are announced, in order
+    upcoming = scheduler.upcoming()
+    assert upcoming == sorted((w for w in windows if not w["open_start"]), key=lambda w: w["start"])
+    assert scheduler.pop_due(start) == []
+    due = scheduler.pop_due(upcoming[0]["start"])
+    assert due and due[0] is upcoming[0]
+
+    # A second session with the same rules reuses the computed windows
+    other = AlertScheduler(threshold=1.0, horizon=datetime.timedelta(hours=12), lead=datetime.timedelta(0),
+                           service=service)
+    other.set_rules(DEFAULT_ASPECT_RULES, 3.0, [], [])
+    other.schedule(start + datetime.timedelta(minutes=20))
+    assert service.stats() == {"feeds": 1, "subscribers": 2, "computed": 1}
+    assert [w for w in other.upcoming() if w["start"] > start + datetime.timedelta(minutes=20)] == other.upcoming()
+    scheduler.close()
+    other.close()
+    assert service.stats()["feeds"] == 0
+    print("SUCCESS: Alert verification passed!")
+
+if __name__ == "__main__":
+    test_alerts()
@@ -0,0 +1,36 @@
+import datetime
+from logic.ephemeris import (
+    get_planetary_positions, get_tropical_positions, get_positions_by_ayanamsa,
+    get_julian_day, get_ayanamsa, AYANAMSAS, _tropical_positions
+)
+
+def test_ayanamsa():
+    dt = datetime.datetime(2024, 5, 1, 6, 30)
+    jd = get_julian_day(dt)
+    tropical = get_tropical_positions(dt)
+    lahiri = get_planetary_positions(dt)
+
+    # Lahiri stays the default and is the tropical position minus get_ayanamsa
+    for planet, deg in lahiri.items():
+        assert abs((tropical[planet] - get_ayanamsa(jd)) % 360.0 - deg) < 1e-9
+
+    # Every system comes from the same cached tropical computation
+    _tropical_positions.cache_clear()
+    systems = get_positions_by_ayanamsa(dt)
+    assert set(systems) == set(AYANAMSAS)
+    assert systems["tropical"] == tropical
+    assert systems["lahiri"] == lahiri
+    get_planetary_positions(dt, ayanamsa="raman")
+    assert _tropical_positions.cache_info().misses == 1
+
+    # Tropical mean node on 2024-05-01 is about 15.47° (Aries), Ketu opposite
+    assert abs(tropical["Rahu"] - 15.47) < 0.1
+    assert abs((tropical["Ketu"] - tropical["Rahu"]) % 360.0 - 180.0) < 1e-9
+    assert abs((tropical["Rahu"] - get_ayanamsa(jd)) % 360.0 - lahiri["Rahu"]) < 1e-9
+
+    offset = (systems["tropical"]["Sun"] - systems["kp"]["Sun"]) % 360.0
+    assert abs(offset - AYANAMSAS["kp"](jd)) < 1e-9
+    print("SUCCESS: Ayanamsa verification passed!")
+
+if __name__ == "__main__":
+    test_ayanamsa()
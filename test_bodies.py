@@ -0,0 +1,66 @@
+import datetime
+import random
+from logic.ephemeris import (
+    get_planetary_positions, register_body, unregister_body, available_bodies,
+    PLANETS, OUTER_PLANETS, CHART_POINTS, FIXED_STARS, PRECISION_FAST
+)
+from logic.calculator import calculate_aspects, candidate_pairs, DEFAULT_ASPECT_RULES, SWEEP_MIN_BODIES
+
+def _brute_force_pairs(n):
+    return [(i, j) for i in range(n) for j in range(i + 1, n)]
+
+def test_bodies():
+    dt = datetime.datetime(2024, 5, 1, 6, 30)
+
+    # The default set is unchanged and extra bodies do not move the others
+    default = get_planetary_positions(dt)
+    assert list(default) == PLANETS
+    bodies = PLANETS + OUTER_PLANETS + CHART_POINTS + list(FIXED_STARS)
+    extended = get_planetary_positions(dt, lat=28.6, lon=77.2, bodies=bodies)
+    assert list(extended) == bodies
+    for planet, deg in default.items():
+        assert extended[planet] == deg
+
+    # Fast precision falls back to the full path for bodies it does not cover
+    fast = get_planetary_positions(dt, lat=28.6, lon=77.2, precision=PRECISION_FAST, bodies=bodies)
+    for body in OUTER_PLANETS + CHART_POINTS:
+        assert fast[body] == extended[body]
+
+    # Chart points depend on the observer
+    elsewhere = get_planetary_positions(dt, lat=51.5, lon=0.0, bodies=CHART_POINTS)
+    assert elsewhere["Ascendant"] != extended["Ascendant"]
+
+    register_body("Test Point", lambda jd: 123.0)
+    try:
+        assert "Test Point" in available_bodies()
+        point = get_planetary_positions(dt, bodies=["Test Point"], ayanamsa="tropical")
+        assert point["Test Point"] == 123.0
+    finally:
+        unregister_body("Test Point")
+    assert "Test Point" not in available_bodies()
+
+    # Sweep-and-prune finds exactly the aspects of the full pair loop
+    rng = random.Random(7)
+    small_rules = {0: DEFAULT_ASPECT_RULES[0], 90: DEFAULT_ASPECT_RULES[90], 180: DEFAULT_ASPECT_RULES[180]}
+    for n in (SWEEP_MIN_BODIES, 40, 150):
+        positions = {f"Body {k}": rng.uniform(0.0, 360.0) for k in range(n)}
+        # Pairs sitting exactly on an orb edge and across 0°
+        positions["Edge A"] = 10.0
+        positions["Edge B"] = 103.0
+        positions["Edge C"] = 359.9999
+        for rules in (DEFAULT_ASPECT_RULES, small_rules):
+            for orb in (0.5, 3.0):
+                pairs = set(candidate_pairs(positions, rules, orb))
+                names = list(positions)
+                for i, j in _brute_force_pairs(len(names)):
+                    if (i, j) not in pairs:
+                        assert not calculate_aspects({names[i]: positions[names[i]], names[j]: positions[names[j]]},
+                                                     rules, orb)
+        pairs = candidate_pairs(positions, small_rules, 3.0)
+        assert pairs == sorted(pairs)
+        assert len(pairs) < len(_brute_force_pairs(len(positions)))
+
+    print("SUCCESS: Body set verification passed!")
+
+if __name__ == "__main__":
+    test_bodies()
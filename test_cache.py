@@ -0,0 +1,76 @@
+import datetime
+import os
+import sqlite3
+import tempfile
+from logic.ephemeris import get_planetary_positions
+from logic.calculator import calculate_aspects, DEFAULT_ASPECT_RULES
+from logic.cache import ResultCache, rules_fingerprint, CACHE_VERSION
+
+def test_cache():
+    dt = datetime.datetime(2024, 5, 1, 6, 30)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.sqlite3")
+
+        with ResultCache(path) as cache:
+            positions, aspects = cache.calculate_aspects(dt, DEFAULT_ASPECT_RULES, 3.0)
+            assert positions == get_planetary_positions(dt)
+            assert aspects == calculate_aspects(positions, DEFAULT_ASPECT_RULES, 3.0)
+            assert cache.misses == 1
+
+        # A new instance (or process) reads the persisted results
+        with ResultCache(path) as cache:
+            assert cache.calculate_aspects(dt, DEFAULT_ASPECT_RULES, 3.0) == (positions, aspects)
+            assert cache.get_planetary_positions(dt) == positions
+            assert cache.hits == 2 and cache.misses == 0
+
+            # A different orb is a different rule set
+            cache.calculate_aspects(dt, DEFAULT_ASPECT_RULES, 2.0)
+            stats = cache.stats()
+            assert stats["positions"] == 1
+            assert stats["aspects"] == 2
+            assert stats["rule_sets"] == 2
+
+        # Results written by another version of the code are dropped on open
+        conn = sqlite3.connect(path)
+        conn.execute(f"PRAGMA user_version = {CACHE_VERSION - 1}")
+        conn.commit()
+        conn.close()
+        with ResultCache(path) as cache:
+            assert cache.stats()["positions"] == 0 and cache.stats()["aspects"] == 0
+        with ResultCache(path) as cache:
+            cache.calculate_aspects(dt, DEFAULT_ASPECT_RULES, 3.0)
+        with ResultCache(path) as cache:
+            assert cache.get_planetary_positions(dt) == positions and cache.hits == 1
+
+        # Eviction gives the freed pages back, so the file itself shrinks
+        conn = sqlite3.connect(path)
+        conn.executemany("INSERT INTO positions (t, data, created) VALUES (?, ?, ?)",
+                         [(k, "x" * 1000, float(k)) for k in range(2000)])
+        conn.commit()
+        conn.close()
+        full_size = os.path.getsize(path)
+        with ResultCache(path, max_bytes=200 * 1024) as cache:
+            cache.evict()
+            assert cache.size_bytes() <= 200 * 1024
+        assert os.path.getsize(path) <= 200 * 1024 < full_size
+
+    # A file from before auto-vacuum is converted when opened
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "old.sqlite3")
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE positions (t INTEGER PRIMARY KEY, data TEXT NOT NULL, created REAL NOT NULL)")
+        conn.close()
+        ResultCache(path).close()
+        conn = sqlite3.connect(path)
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        conn.close()
+
+    # Rule order changes the result of calculate_aspects, so it changes the key
+    reordered = dict(reversed(list(DEFAULT_ASPECT_RULES.items())))
+    assert rules_fingerprint(reordered) != rules_fingerprint(DEFAULT_ASPECT_RULES)
+    assert rules_fingerprint({0: {"name": "C", "trend": "Positive"}}) == \
+        rules_fingerprint({0.0: {"name": "C", "trend": "Positive"}})
+    print("SUCCESS: Cache verification passed!")
+
+if __name__ == "__main__":
+    test_cache()
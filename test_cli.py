@@ -0,0 +1,49 @@
+import contextlib
+import io
+import json
+from cli import build_parser, run
+
+def test_cli():
+    args = build_parser().parse_args(["--fields", "positions", "summary"])
+    stdin = io.StringIO("2024-05-01T06:30:00\n\n1714545000\n")
+    stdout = io.StringIO()
+    assert run(args, stdin=stdin, stdout=stdout) == 2
+
+    records = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    # The ISO and Unix forms name the same instant
+    assert records[0]["positions"] == records[1]["positions"]
+    assert set(records[0]) == {"time", "positions", "summary"}
+
+    args = build_parser().parse_args(["--start", "2024-01-01", "--end", "2024-01-01T01:00", "--step", "15m",
+                                      "--fields", "aspects"])
+    stdout = io.StringIO()
+    assert run(args, stdin=io.StringIO(), stdout=stdout) == 4
+
+    # Unix seconds, ISO and ISO with an offset mix freely in a range (all UTC)
+    args = build_parser().parse_args(["--start", "1714545000", "--end", "2024-05-01T09:30+02:00", "--step", "15m",
+                                      "--fields", "positions"])
+    stdout = io.StringIO()
+    assert run(args, stdin=io.StringIO(), stdout=stdout) == 4
+    assert json.loads(stdout.getvalue().splitlines()[0])["time"] == "2024-05-01T06:30:00"
+    args = build_parser().parse_args(["--start", "1714545000", "--end", "2024-05-01T03:00"])
+    assert run(args, stdin=io.StringIO(), stdout=io.StringIO()) == 0
+
+    # A bad line on stdin is reported and skipped; the rest still come out
+    args = build_parser().parse_args(["--fields", "positions"])
+    stdin = io.StringIO("2024-05-01T06:30:00\nyesterday\n1e30\n1714545000\n")
+    stdout, stderr = io.StringIO(), io.StringIO()
+    assert run(args, stdin=stdin, stdout=stdout, stderr=stderr) == 2
+    errors = stderr.getvalue().splitlines()
+    assert len(errors) == 2 and errors[0].startswith("line 2:") and errors[1].startswith("line 3:")
+
+    # Bad arguments are usage errors
+    try:
+        with contextlib.redirect_stderr(io.StringIO()):
+            build_parser().parse_args(["--start", "yesterday", "--end", "2024-05-01"])
+        assert False, "an invalid --start should be refused"
+    except SystemExit:
+        pass
+    print("SUCCESS: CLI verification passed!")
+
+if __name__ == "__main__":
+    test_cli()
@@ -0,0 +1,44 @@
+import datetime
+from logic.ephemeris import get_julian_day, get_sidereal_longitude
+from logic.events import find_events
+
+def _dense_sign_changes(body, start, end, step_hours=1):
+    """Counts sign changes by brute-force sampling, for comparison."""
+    changes = 0
+    t = start
+    prev = int(get_sidereal_longitude(body, get_julian_day(t)) // 30)
+    while t < end:
+        t += datetime.timedelta(hours=step_hours)
+        sign = int(get_sidereal_longitude(body, get_julian_day(t)) // 30)
+        if sign != prev:
+            changes += 1
+        prev = sign
+    return changes
+
+def test_events():
+    # Mercury retrograde of Aug 2024 crosses Leo/Cancer back and forth
+    start = datetime.datetime(2024, 7, 20)
+    end = datetime.datetime(2024, 9, 15)
+    stats = {}
+    events = list(find_events(start, end, bodies=["Mercury"], stats=stats))
+
+    stations = [e["event"] for e in events if e["event"].startswith("station")]
+    assert stations == ["station_retrograde", "station_direct"], stations
+
+    ingresses = [e for e in events if e["event"] == "sign_ingress"]
+    assert len(ingresses) == _dense_sign_changes("Mercury", start, end)
+    assert [e["retrograde"] for e in ingresses] == [False, True, False]
+
+    # Each ingress must be timed to within a second
+    one_second = 1.0 / 86400.0
+    for e in ingresses:
+        before = get_sidereal_longitude("Mercury", e["jd"] - one_second)
+        after = get_sidereal_longitude("Mercury", e["jd"] + one_second)
+        assert int(before // 30) != int(after // 30), e
+
+    # Events stream in chronological order
+    assert all(a["jd"] <= b["jd"] for a, b in zip(events, events[1:]))
+    print(f"Found {len(events)} events with {stats['evaluations']} evaluations")
+
+if __name__ == "__main__":
+    test_events()
@@ -0,0 +1,69 @@
+import datetime
+import threading
+import flet as ft
+import loadtest
+from loadtest import (LatencyRecorder, StubPage, percentile, format_report, failed, run_session,
+                      run_load_test, check_flet_support, FLET_INTERNALS)
+
+def test_loadtest():
+    values = [k / 100.0 for k in range(1, 101)]
+    assert percentile(values, 50) == 0.5
+    assert percentile(values, 99) == 0.99
+    assert percentile([0.2], 95) == 0.2
+
+    # Handlers started through the stub page are timed by name
+    recorder = LatencyRecorder()
+    page = StubPage(recorder)
+    done = threading.Event()
+
+    def refine():
+        done.set()
+
+    def failing():
+        raise RuntimeError("boom")
+
+    page.run_thread(refine)
+    page.run_thread(failing)
+    for thread in page.timed_threads:
+        thread.join()
+    assert done.is_set() and len(recorder.samples["refine"]) == 1
+    page.update()
+    assert len(recorder.samples["update"]) == 1
+
+    report = {
+        "stages": {"event": {"count": 1, "p50": 1.0, "p95": 1.0, "p99": 1.0}},
+        "events": 1, "seconds": 1.0, "throughput": 1.0, "errors": 0, "bytes_per_session": None,
+    }
+    assert "1 sessions, 1 events" in format_report(report, 1)
+    assert not failed(report)
+
+    # A crashing session is reported, and a run that replayed nothing fails
+    recorder = LatencyRecorder()
+    original = loadtest.app_main
+    loadtest.app_main = lambda page: 1 / 0
+    try:
+        run_session(recorder, 3, 0.0, 1, datetime.date(2024, 5, 1), [])
+    finally:
+        loadtest.app_main = original
+    assert recorder.errors == 1 and "ZeroDivisionError" in recorder.messages[0]
+    assert failed(dict(report, events=0))
+
+    # Unsupported Flet releases are refused up front
+    try:
+        check_flet_support()
+        supported = True
+    except RuntimeError:
+        supported = False
+    assert supported == all(hasattr(ft.Control, name) for name in FLET_INTERNALS)
+
+    # A short run end to end through the real app, where the installed Flet allows it
+    if supported:
+        report = run_load_test(sessions=2, events=3, think=0)
+        assert not failed(report), report["messages"]
+        assert report["events"] == 6 and report["stages"]["event"]["count"] == 6
+    else:
+        print("Skipped the end-to-end run: unsupported Flet")
+    print("SUCCESS: Load test harness verification passed!")
+
+if __name__ == "__main__":
+    test_loadtest()
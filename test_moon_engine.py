@@ -0,0 +1,33 @@
+import random
+from pymeeus.Epoch import Epoch
+from pymeeus.Moon import Moon
+from logic.moon_engine import MoonEngine, MAX_TERMS, benchmark
+
+def test_moon_engine():
+    rng = random.Random(11)
+    jds = [rng.uniform(2415020.5, 2488069.5) for _ in range(100)]
+    reference = [float(Moon.apparent_ecliptical_pos(Epoch(jd))[0]) % 360.0 for jd in jds]
+
+    # Fewer terms, larger error, but never beyond the advertised bound
+    for target in (None, 0.001, 0.01, 0.1):
+        engine = MoonEngine(max_error_deg=target)
+        if target is not None:
+            assert engine.error_bound_deg <= target
+        values = engine.longitudes(jds)
+        for jd, value, ref in zip(jds, values, reference):
+            error = abs((value - ref + 180.0) % 360.0 - 180.0)
+            assert error <= engine.error_bound_deg, (target, jd, error)
+    assert MoonEngine().terms == MAX_TERMS
+    assert MoonEngine(max_error_deg=0.1).terms < MoonEngine(max_error_deg=0.01).terms
+
+    # Batched and single evaluation agree
+    engine = MoonEngine(terms=20)
+    assert engine.longitudes(jds[:5]) == [engine.longitude(jd) for jd in jds[:5]]
+
+    rows = benchmark([10, MAX_TERMS], samples=20)
+    assert rows[0]["max_error"] > rows[1]["max_error"]
+    assert rows[1]["us_per_epoch"] < rows[-1]["us_per_epoch"]
+    print("SUCCESS: Moon engine verification passed!")
+
+if __name__ == "__main__":
+    test_moon_engine()
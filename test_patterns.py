@@ -0,0 +1,57 @@
+import datetime
+import io
+import json
+from logic.calculator import calculate_aspects
+from logic.ephemeris import get_position_series
+from logic.patterns import (find_patterns, pattern_series, compile_patterns, aspect_masks, match_patterns,
+                            DEFAULT_PATTERNS)
+from cli import build_parser, run
+
+def test_patterns():
+    # Grand Trine with a Kite tail, and a T-Square, each reported once
+    positions = {"Sun": 10.0, "Moon": 130.5, "Mars": 249.0, "Venus": 190.0, "Jupiter": 55.0, "Saturn": 145.0,
+                 "Mercury": 325.0}
+    found = find_patterns(positions)
+    by_name = {}
+    for match in found:
+        by_name.setdefault(match["pattern"], []).append(match["bodies"])
+    assert [set(b) for b in by_name["Grand Trine"]] == [{"Sun", "Moon", "Mars"}]
+    assert [set(b) for b in by_name["Kite"]] == [{"Sun", "Moon", "Mars", "Venus"}]
+    # Bodies follow the pattern's vertices: Venus is the Kite's tail, Jupiter the T-Square's apex
+    assert by_name["Kite"][0][0] == "Sun" and by_name["Kite"][0][3] == "Venus"
+    assert [set(b) for b in by_name["T-Square"]] == [{"Jupiter", "Saturn", "Mercury"}]
+    assert by_name["T-Square"][0][2] == "Jupiter"
+
+    # Masks built from existing aspect results give the same matches
+    bodies = list(positions)
+    masks = aspect_masks(calculate_aspects(positions), bodies)
+    assert match_patterns(masks, compile_patterns(), bodies) == found
+
+    # Custom definitions must use rule angles
+    custom = {"Trine Pair": {"edges": [[0, 1, 120]]}}
+    assert len(find_patterns(positions, custom)) == 3
+    try:
+        compile_patterns({"Bad": {"edges": [[0, 1, 100]]}})
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+    # A series agrees with instant-by-instant search
+    start = datetime.datetime(2024, 1, 1)
+    times = [start + datetime.timedelta(hours=6 * k) for k in range(200)]
+    columns = get_position_series(times, precision="fast")
+    series = pattern_series(columns)
+    assert len(series) == len(times)
+    for k in range(0, len(times), 17):
+        assert series[k] == find_patterns({b: columns[b][k] for b in columns})
+
+    # The CLI reads patterns alongside the rules
+    args = build_parser().parse_args(["--at", "2024-01-01T00:00", "--fields", "patterns", "--precision", "fast"])
+    stdout = io.StringIO()
+    run(args, stdin=io.StringIO(), stdout=stdout)
+    assert json.loads(stdout.getvalue())["patterns"] == series[0]
+    assert set(DEFAULT_PATTERNS) >= {"Grand Trine", "T-Square", "Yod"}
+    print("SUCCESS: Pattern engine verification passed!")
+
+if __name__ == "__main__":
+    test_patterns()
@@ -0,0 +1,40 @@
+import datetime
+import random
+import time
+from logic.ephemeris import get_planetary_positions, PRECISION_FAST
+from logic.calculator import calculate_aspects, DEFAULT_ASPECT_RULES
+from logic.fast_ephemeris import FAST_ERROR_DEG
+from logic.preview import preview_aspects
+
+def _classify(aspects):
+    return sorted((a["planet1"], a["planet2"], a["aspect_name"], a["trend"]) for a in aspects)
+
+def test_preview():
+    random.seed(42)
+    start = datetime.datetime(1950, 1, 1)
+    fast_seconds = 0.0
+    for _ in range(60):
+        dt = start + datetime.timedelta(minutes=random.randrange(100 * 365 * 1440))
+        exact = get_planetary_positions(dt)
+
+        t0 = time.perf_counter()
+        fast = get_planetary_positions(dt, precision=PRECISION_FAST)
+        fast_seconds += time.perf_counter() - t0
+
+        for planet, deg in exact.items():
+            error = abs((fast[planet] - deg + 180.0) % 360.0 - 180.0)
+            assert error <= FAST_ERROR_DEG.get(planet, 1e-9), (dt, planet, error)
+
+        # The refined preview classifies every pair like the full path
+        positions, aspects = preview_aspects(dt, DEFAULT_ASPECT_RULES, 3.0)
+        assert _classify(aspects) == _classify(calculate_aspects(exact, DEFAULT_ASPECT_RULES, 3.0)), dt
+
+        # Unrefined, it is the plain fast result
+        positions, aspects = preview_aspects(dt, DEFAULT_ASPECT_RULES, 3.0, refine=False)
+        assert positions == fast and aspects == calculate_aspects(fast, DEFAULT_ASPECT_RULES, 3.0)
+
+    print(f"Fast path: {fast_seconds / 60 * 1000:.3f} ms per instant")
+    print("SUCCESS: Preview verification passed!")
+
+if __name__ == "__main__":
+    test_preview()
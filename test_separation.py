@@ -0,0 +1,34 @@
+import datetime
+import math
+from logic.separation import lttb, minmax, separation_chart_data, MAX_SAMPLES
+
+def test_separation():
+    # A sharp dip survives both reductions
+    values = [abs(math.sin(k / 500.0)) * 180.0 for k in range(4000)]
+    values[2345] = 0.0
+    kept = lttb(values, 400)
+    assert len(kept) == 400 and kept[0] == 0 and kept[-1] == len(values) - 1
+    assert kept == sorted(kept) and 2345 in kept
+    kept = minmax(values, 200)
+    assert len(kept) <= 400 and 2345 in kept and values.index(max(values)) in kept
+
+    # The chart never ships more points than pixels
+    start = datetime.datetime(2024, 5, 1)
+    end = start + datetime.timedelta(days=14)
+    pairs = [("Sun", "Moon"), ("Mars", "Saturn")]
+    for method in ("lttb", "minmax"):
+        series = separation_chart_data(start, end, pairs, 600, method=method)
+        assert set(series) == set(pairs)
+        for points in series.values():
+            assert len(points) <= 600
+            assert points[0][0] == start and points[-1][0] <= end
+            assert all(0.0 <= deg <= 180.0 for _, deg in points)
+
+    # The Sun-Moon curve still reaches the new moon of 2024-05-08 (~03:22 UTC)
+    closest = min(series[("Sun", "Moon")], key=lambda p: p[1])
+    assert abs(closest[0] - datetime.datetime(2024, 5, 8, 3, 22)) < datetime.timedelta(hours=2)
+    assert len(separation_chart_data(start, end, pairs, 10 ** 6)[("Sun", "Moon")]) <= MAX_SAMPLES
+    print("SUCCESS: Separation chart verification passed!")
+
+if __name__ == "__main__":
+    test_separation()
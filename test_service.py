@@ -0,0 +1,57 @@
+import datetime
+import threading
+from logic.ephemeris import get_planetary_positions
+from logic.calculator import calculate_aspects, DEFAULT_ASPECT_RULES
+from logic.service import CalculationService
+
+def test_service():
+    service = CalculationService(max_workers=2)
+    dt = datetime.datetime(2024, 5, 1, 6, 30)
+    sessions = [service.open_session() for _ in range(20)]
+    results = [None] * len(sessions)
+
+    def run(i):
+        results[i] = sessions[i].calculate(dt, DEFAULT_ASPECT_RULES, 3.0)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(sessions))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # Twenty sessions, one computation, one shared result object
+    assert service.computed == 1
+    assert all(r is results[0] for r in results)
+    positions = get_planetary_positions(dt)
+    assert dict(results[0].positions) == positions
+    assert [dict(a) for a in results[0].aspects] == calculate_aspects(positions, DEFAULT_ASPECT_RULES, 3.0)
+
+    # Shared results are read-only
+    try:
+        results[0].positions["Sun"] = 0.0
+        assert False, "positions should be read-only"
+    except TypeError:
+        pass
+
+    # The body set is part of the query
+    extra = sessions[0].calculate(dt, DEFAULT_ASPECT_RULES, 3.0, None, None, ["Sun", "Moon", "Uranus"])
+    assert service.computed == 2 and list(extra.positions) == ["Sun", "Moon", "Uranus"]
+    assert dict(extra.positions) == get_planetary_positions(dt, bodies=["Sun", "Moon", "Uranus"])
+
+    stats = service.stats()
+    assert stats["sessions"] == 20 and stats["session_bytes"] > 0
+
+    # Each session stays within its memory budget
+    small = service.open_session(max_bytes=1)
+    for minutes in range(3):
+        small.calculate(dt + datetime.timedelta(minutes=minutes))
+    assert len(small._recent) == 1
+
+    for s in sessions + [small]:
+        s.close()
+    assert service.stats()["sessions"] == 0
+    service.shutdown()
+    print("SUCCESS: Service verification passed!")
+
+if __name__ == "__main__":
+    test_service()
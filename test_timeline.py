@@ -0,0 +1,41 @@
+import datetime
+import random
+from logic.timeline import AspectTimeline, sample_aspects, search_intervals
+
+def _key(item):
+    return (item["planet1"], item["planet2"], item["aspect_name"])
+
+def test_timeline():
+    start = datetime.datetime(2024, 5, 1)
+    end = start + datetime.timedelta(days=1)
+    step = datetime.timedelta(minutes=10)
+    samples = list(sample_aspects(start, end, step))
+    timeline = AspectTimeline.from_samples(samples)
+
+    # Far fewer intervals than rows, and the same state at every sample
+    rows = sum(len(aspects) for _, aspects in samples)
+    assert len(timeline) * 10 < rows
+    for dt, aspects in samples:
+        assert sorted(map(_key, timeline.active_at(dt))) == sorted(map(_key, aspects)), dt
+
+    # Tree queries agree with a linear scan
+    rng = random.Random(3)
+    for _ in range(50):
+        t0 = start + datetime.timedelta(minutes=rng.randrange(1440))
+        t1 = t0 + datetime.timedelta(minutes=rng.randrange(300))
+        expected = [iv for iv in timeline if iv["start"] <= t1 and iv["end"] >= t0]
+        assert sorted(map(_key, timeline.overlapping(t0, t1))) == sorted(map(_key, expected))
+
+    # Exact edges fall within one sampling step of the sampled ones
+    exact = AspectTimeline(search_intervals(start, end))
+    assert sorted(map(_key, exact)) == sorted(map(_key, timeline))
+    margin = step + datetime.timedelta(minutes=1)
+    for iv in exact:
+        sampled = min((s for s in timeline if _key(s) == _key(iv)), key=lambda s: abs(s["start"] - iv["start"]))
+        assert sampled["start"] - margin <= iv["start"] <= sampled["start"]
+        assert sampled["end"] <= iv["end"] <= sampled["end"] + margin
+        assert iv["min_orb"] <= sampled["min_orb"]
+    print("SUCCESS: Timeline verification passed!")
+
+if __name__ == "__main__":
+    test_timeline()
@@ -0,0 +1,73 @@
+import datetime
+import threading
+import time
+from logic.calculator import DEFAULT_ASPECT_RULES
+from logic.service import CalculationService
+from logic.warmup import CacheWarmer, warm_order
+
+def test_warmup():
+    center = datetime.datetime(2024, 5, 1, 12, 0)
+    step = datetime.timedelta(minutes=15)
+    order = warm_order(center, datetime.timedelta(hours=1), step)
+    assert order[:3] == [center, center + step, center - step] and len(order) == 9
+
+    service = CalculationService(max_workers=2)
+    session = service.open_session(warm_max_bytes=20000)
+    warmer = CacheWarmer(session, radius=datetime.timedelta(hours=1), idle_seconds=0.0)
+    rule_args = (DEFAULT_ASPECT_RULES, 3.0, [], [])
+    warmer.set_target(center, *rule_args)
+    while warmer.warm_next():
+        pass
+
+    # Stopped at the budget, nearest instants first, shared with other sessions
+    assert 0 < warmer.warmed < len(order)
+    assert session.memory_bytes() <= 20000 + 5000
+    assert service.stats()["results"] == service.computed
+    computed = service.computed
+    session.calculate(center + step, *rule_args)
+    assert service.computed == computed and session.warm_hits == 1
+
+    # Warming from an unaligned now covers tomorrow's date pick
+    now = datetime.datetime(2024, 5, 1, 9, 7, 23)
+    assert all(t.second == 0 and t.minute % 15 == 0 for t in warm_order(now))
+    picker = service.open_session()
+    warmer = CacheWarmer(picker, idle_seconds=0.0)
+    warmer.set_target(now, *rule_args)
+    for _ in range(5):
+        warmer.warm_next()
+    tomorrow = now.date() + datetime.timedelta(days=1)
+    picker.calculate(datetime.datetime.combine(tomorrow, datetime.time(12, 0)), *rule_args)
+    assert picker.warm_hits == 1
+
+    # Warm-up results are the first to leave a full shared LRU
+    small = CalculationService(max_results=2)
+    kept = small.calculate(center, *rule_args)
+    warm_session = small.open_session()
+    for minutes in (15, 30, 45):
+        warm_session.prefetch(center + datetime.timedelta(minutes=minutes), *rule_args)
+    assert small.calculate(center, *rule_args) is kept and small.computed == 4
+
+    # An interactive request takes over warm-up work that has not started
+    gate = threading.Event()
+    small._warm_executor.submit(gate.wait)
+    queued = small.submit(center + datetime.timedelta(hours=5), *rule_args, warm=True)
+    result = small.calculate(center + datetime.timedelta(hours=5), *rule_args)
+    assert queued.cancelled() and result is not None
+    gate.set()
+    small.shutdown()
+
+    # While the user keeps interacting nothing is warmed
+    busy = CacheWarmer(service.open_session(), radius=datetime.timedelta(hours=1), idle_seconds=60.0)
+    busy.set_target(center + datetime.timedelta(days=1), *rule_args)
+    thread = threading.Thread(target=busy.run)
+    thread.start()
+    time.sleep(0.2)
+    busy.stop()
+    thread.join()
+    assert busy.warmed == 0
+
+    service.shutdown()
+    print("SUCCESS: Warm-up verification passed!")
+
+if __name__ == "__main__":
+    test_warmup()
@@ -0,0 +1,219 @@
+import datetime
+from logic.ephemeris import get_planetary_positions, PRECISION_FULL
+from logic.calculator import calculate_aspects, DEFAULT_ASPECT_RULES
+from logic.sampling import SampledTracks
+
+def _new_interval(dt, aspect):
+    return {
+        "planet1": aspect["planet1"],
+        "planet2": aspect["planet2"],
+        "aspect_name": aspect["aspect_name"],
+        "trend": aspect["trend"],
+        "start": dt,
+        "end": dt,
+        "min_orb": aspect["orb_diff"],
+        "exact": dt,
+    }
+
+class TimelineEncoder:
+    """
+    Run-length encodes successive calculate_aspects results into intervals.
+
+    Each interval is a dict {planet1, planet2, aspect_name, trend, start, end,
+    min_orb, exact}: the pair held the same aspect and trend at every sample
+    from start to end (both inclusive), and was closest to exact at `exact`.
+    """
+    def __init__(self):
+        self._open = {}
+
+    def add(self, dt: datetime.datetime, aspects: list):
+        """
+        Feeds the aspects found at dt. Samples must arrive in time order.
+
+        Returns:
+            list: intervals that ended at the previous sample, sorted by start
+        """
+        closed = []
+        seen = set()
+        for aspect in aspects:
+            pair = (aspect["planet1"], aspect["planet2"])
+            seen.add(pair)
+            current = self._open.get(pair)
+            if current is not None and current["aspect_name"] == aspect["aspect_name"] \
+                    and current["trend"] == aspect["trend"]:
+                current["end"] = dt
+                if aspect["orb_diff"] < current["min_orb"]:
+                    current["min_orb"] = aspect["orb_diff"]
+                    current["exact"] = dt
+                continue
+            if current is not None:
+                closed.append(current)
+            self._open[pair] = _new_interval(dt, aspect)
+
+        for pair in [p for p in self._open if p not in seen]:
+            closed.append(self._open.pop(pair))
+        closed.sort(key=lambda iv: iv["start"])
+        return closed
+
+    def close(self):
+        """Ends every interval still open. Returns them sorted by start."""
+        rest = sorted(self._open.values(), key=lambda iv: iv["start"])
+        self._open = {}
+        return rest
+
+def sample_aspects(start: datetime.datetime, end: datetime.datetime, step: datetime.timedelta,
+                   rules: dict = None, orb: float = 3.0, specific_rules: list = None, range_rules: list = None):
+    """Yields (datetime, aspects) every `step` from start up to and including end."""
+    t = start
+    while t <= end:
+        yield t, calculate_aspects(get_planetary_positions(t), rules, orb, specific_rules, range_rules)
+        t += step
+
+def intervals_from_samples(samples):
+    """
+    Encodes sampled aspects into intervals.
+
+    Args:
+        samples: iterable of (datetime, aspects list) in time order,
+                 e.g. from sample_aspects
+
+    Returns:
+        list of dicts: intervals as described in TimelineEncoder, sorted by start
+    """
+    encoder = TimelineEncoder()
+    intervals = []
+    for dt, aspects in samples:
+        intervals.extend(encoder.add(dt, aspects))
+    intervals.extend(encoder.close())
+    intervals.sort(key=lambda iv: iv["start"])
+    return intervals
+
+def search_intervals(start: datetime.datetime, end: datetime.datetime, rules: dict = None, orb: float = 3.0,
+                     specific_rules: list = None, range_rules: list = None, precision: str = PRECISION_FULL):
+    """
+    Aspect intervals in [start, end] with exact edges.
+
+    Positions are computed once per sampling.SAMPLE_STEP. Each edge and exact time is
+    then refined on the linearly interpolated longitudes to sampling.EDGE_TOLERANCE,
+    applying the rules just as calculate_aspects does at every instant.
+    Intervals still active at start or end are clipped there. `precision`
+    selects the ephemeris used for the samples.
+
+    Returns:
+        list of dicts: intervals as described in TimelineEncoder, sorted by start
+    """
+    if rules is None:
+        rules = DEFAULT_ASPECT_RULES
+
+    sampled = SampledTracks(start, end, precision)
+    times = sampled.times
+    index = {t: k for k, t in enumerate(times)}
+
+    def pair_aspect(p1, p2, x):
+        # The aspect calculate_aspects reports for one pair at position x
+        found = calculate_aspects(sampled.positions_at((p1, p2), x), rules, orb, specific_rules, range_rules)
+        return found[0] if found else None
+
+    coarse = intervals_from_samples(
+        (t, calculate_aspects(s, rules, orb, specific_rules, range_rules)) for t, s in zip(times, sampled.samples)
+    )
+
+    intervals = []
+    for iv in coarse:
+        def orb_at(x, iv=iv):
+            # Distance from exact, or infinity once the pair has another (or no) aspect
+            aspect = pair_aspect(iv["planet1"], iv["planet2"], x)
+            if aspect is None or aspect["aspect_name"] != iv["aspect_name"] or aspect["trend"] != iv["trend"]:
+                return float("inf")
+            return aspect["orb_diff"]
+
+        def inside(x):
+            return orb_at(x) != float("inf")
+
+        k_start, k_end = index[iv["start"]], index[iv["end"]]
+        x_start = sampled.edge(inside, k_start - 1, k_start) if k_start > 0 else 0.0
+        x_end = sampled.edge(inside, k_end + 1, k_end) if k_end < sampled.last else float(sampled.last)
+
+        # Exact time: ternary search around the closest sample
+        k_best = index[iv["exact"]]
+        x_best = sampled.closest(orb_at, max(k_best - 1.0, x_start), min(k_best + 1.0, x_end))
+        min_orb = orb_at(x_best)
+        if min_orb > iv["min_orb"]:
+            # The closest approach is at the sampled instant itself
+            x_best, min_orb = float(k_best), iv["min_orb"]
+
+        iv.update({
+            "start": sampled.time_at(x_start),
+            "end": sampled.time_at(x_end),
+            "min_orb": min_orb,
+            "exact": sampled.time_at(x_best),
+        })
+        intervals.append(iv)
+
+    intervals.sort(key=lambda iv: iv["start"])
+    return intervals
+
+class AspectTimeline:
+    """
+    Aspect intervals indexed for time queries.
+
+    The intervals are kept sorted by start and read as an implicit balanced
+    tree (each node is the middle of its range) annotated with the latest end
+    in its subtree, so a query only descends into subtrees that can overlap.
+    """
+    def __init__(self, intervals: list):
+        self.intervals = sorted(intervals, key=lambda iv: (iv["start"], iv["end"]))
+        self._starts = [iv["start"] for iv in self.intervals]
+        self._max_end = [None] * len(self.intervals)
+        self._annotate(0, len(self.intervals))
+
+    def _annotate(self, lo, hi):
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        latest = self.intervals[mid]["end"]
+        for child in (self._annotate(lo, mid), self._annotate(mid + 1, hi)):
+            if child is not None and child > latest:
+                latest = child
+        self._max_end[mid] = latest
+        return latest
+
+    @classmethod
+    def from_samples(cls, samples):
+        """Timeline of sampled (datetime, aspects) pairs, see intervals_from_samples."""
+        return cls(intervals_from_samples(samples))
+
+    @classmethod
+    def search(cls, start: datetime.datetime, end: datetime.datetime, rules: dict = None, orb: float = 3.0,
+               specific_rules: list = None, range_rules: list = None):
+        """Timeline with exact edges, see search_intervals."""
+        return cls(search_intervals(start, end, rules, orb, specific_rules, range_rules))
+
+    def __len__(self):
+        return len(self.intervals)
+
+    def __iter__(self):
+        return iter(self.intervals)
+
+    def overlapping(self, t0: datetime.datetime, t1: datetime.datetime):
+        """Intervals sharing at least one instant with [t0, t1], sorted by start."""
+        found = []
+        stack = [(0, len(self.intervals))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if self._max_end[mid] < t0:
+                # Nothing in this subtree reaches t0
+                continue
+            stack.append((lo, mid))
+            if self._starts[mid] <= t1:
+                if self.intervals[mid]["end"] >= t0:
+                    found.append(mid)
+                stack.append((mid + 1, hi))
+        return [self.intervals[k] for k in sorted(found)]
+
+    def active_at(self, t: datetime.datetime):
+        """Intervals active at instant t."""
+        return self.overlapping(t, t)
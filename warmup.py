@@ -0,0 +1,126 @@
+import datetime
+import threading
+import time
+from logic.cache import rules_fingerprint
+from logic.sampling import ceil_time
+
+# Instants warmed on either side of the selected one, on whole marks of the ±15m button step
+WARM_RADIUS = datetime.timedelta(days=2)
+WARM_STEP = datetime.timedelta(minutes=15)
+
+# Warming waits until the user has been idle this long
+IDLE_SECONDS = 2.0
+
+def warm_order(center: datetime.datetime, radius: datetime.timedelta = WARM_RADIUS,
+               step: datetime.timedelta = WARM_STEP):
+    """
+    Instants requests are likely to ask for next, in warming order.
+
+    A picked date opens at 12:00 and the ±15m buttons move from there, so
+    requests land on whole step marks rather than on offsets from an
+    arbitrary `now`. Noon on each day the window touches comes first, then
+    every whole mark within radius of center, nearest first.
+    """
+    noons = []
+    day = (center - radius).date()
+    while day <= (center + radius).date():
+        noons.append(datetime.datetime.combine(day, datetime.time(12, 0), tzinfo=center.tzinfo))
+        day += datetime.timedelta(days=1)
+
+    marks = []
+    t = ceil_time(center - radius, step)
+    while t <= center + radius:
+        marks.append(t)
+        t += step
+
+    def nearest(t):
+        # Later instants win ties: stepping forward is the more common move
+        return abs(t - center), t < center
+
+    return sorted(noons, key=nearest) + [t for t in sorted(marks, key=nearest) if t not in noons]
+
+class CacheWarmer:
+    """
+    Fills a CalculationSession with results around the selected instant so
+    the next date pick or time step is served from memory.
+
+    Work happens only while the user is idle, one instant at a time and
+    nearest first, and stops once the session's warm budget is used up.
+    Each set_target call counts as user activity and re-centres the window.
+    """
+    def __init__(self, session, radius: datetime.timedelta = WARM_RADIUS, step: datetime.timedelta = WARM_STEP,
+                 idle_seconds: float = IDLE_SECONDS):
+        self.session = session
+        self.radius = radius
+        self.step = step
+        self.idle_seconds = idle_seconds
+        self.warmed = 0
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._target = None
+        self._rule_args = None
+        self._pending = []
+        self._pass_bytes = 0
+        self._last_activity = time.monotonic()
+        self._stopped = False
+
+    def set_target(self, center: datetime.datetime, rules: dict = None, orb: float = 3.0,
+                   specific_rules: list = None, range_rules: list = None, bodies: list = None):
+        """Records user activity and warms around `center` for these rules and bodies once idle."""
+        target = (center, rules_fingerprint(rules, orb, specific_rules, range_rules),
+                  tuple(bodies) if bodies is not None else None)
+        with self._lock:
+            self._last_activity = time.monotonic()
+            if target != self._target:
+                self._target = target
+                self._rule_args = (rules, orb, specific_rules, range_rules, bodies)
+                # Popped from the end, so the nearest instants come first
+                self._pending = list(reversed(warm_order(center, self.radius, self.step)))
+                self._pass_bytes = 0
+        self._wakeup.set()
+
+    def notify_activity(self):
+        """Postpones warming without moving the window."""
+        with self._lock:
+            self._last_activity = time.monotonic()
+        self._wakeup.set()
+
+    def warm_next(self):
+        """
+        Warms the next instant of the current window.
+
+        Returns:
+            bool: False when the window is done or the budget is used up
+        """
+        with self._lock:
+            if not self._pending or self._pass_bytes >= self.session.warm_max_bytes:
+                return False
+            dt = self._pending.pop()
+            rule_args = self._rule_args
+
+        size = self.session.prefetch(dt, *rule_args)
+        with self._lock:
+            self._pass_bytes += size
+            if size:
+                self.warmed += 1
+        return True
+
+    def run(self):
+        """Warming loop; run it on a background thread after the first paint."""
+        while not self._stopped:
+            with self._lock:
+                idle_for = time.monotonic() - self._last_activity
+            if idle_for < self.idle_seconds:
+                self._wakeup.wait(self.idle_seconds - idle_for)
+                self._wakeup.clear()
+                continue
+            if not self.warm_next():
+                # Nothing left until the window moves
+                self._wakeup.wait()
+                self._wakeup.clear()
+
+    def stop(self):
+        """Ends run() after the instant being computed."""
+        self._stopped = True
+        self._wakeup.set()